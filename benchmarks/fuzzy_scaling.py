@@ -0,0 +1,172 @@
+"""
+Benchmark for serial vs process-pool fuzzy faculty matching.
+
+Builds a synthetic directory of --people faculty entries (three searchable
+name variants each, like StaffLookup._build_searchable_names), then times
+FuzzyMatcher.best for the forward and reversed form of --queries lookups at
+every worker count in --workers. Workers=1 is the serial baseline. Pool start
+up is timed separately, since a long-running process pays it once.
+
+Every parallel result is checked against the serial one, so a run also proves
+the sharded search returns the same matches.
+
+Usage:
+    python benchmarks/fuzzy_scaling.py --people 20000,60000 --workers 1,2,4,8
+
+Results (20 queries, two seeds) from the only machine measured so far, a
+single-CPU container, where available_workers() already keeps the pool off:
+
+    people  candidates  serial mean ms  2 workers  4 workers
+     5,000      11,500           55-67  0.73-0.90x 0.61-0.98x
+    20,000      46,000         234-245  0.88-1.18x 1.06-1.16x
+    60,000     138,000        720-1074  1.11-1.13x 0.84-1.55x
+
+Serial scoring costs about 5 us per candidate, and starting the pool takes
+0.05-0.6 s. On one CPU the "speedups" are noise. fuzzy.PARALLEL_THRESHOLD sits
+where a serial query reaches about 200 ms, so a few ms of dispatch per query
+is small next to the work being split, and fuzzy.POOL_WARMUP is the serial
+work (0.6 s / 5 us) that pays for the slowest pool start-up seen.
+
+No multi-core host has been available to measure on yet. Run the benchmark on
+one and add its rows here before tuning either constant.
+"""
+
+import json
+import os
+import random
+import string
+import time
+from typing import Any
+
+import click
+
+from warrior_bot.utils.faculty_lookup import FACULTY_CUTOFF, StaffLookup
+from warrior_bot.utils.fuzzy import FuzzyMatcher, available_workers
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def build_faculty(people: int, seed: int) -> list[dict[str, str | None]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "first": _word(rng).title(),
+            "middle": _word(rng)[0].upper() if rng.random() < 0.3 else None,
+            "last": _word(rng).title(),
+        }
+        for _ in range(people)
+    ]
+
+
+def build_queries(
+    faculty: list[dict[str, str | None]], count: int, seed: int
+) -> list[str]:
+    """Mostly real names with a typo, some reversed, some unknown."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        entry = rng.choice(faculty)
+        name = f"{entry['first']} {entry['last']}".lower()
+        if roll < 0.6:
+            i = rng.randrange(len(name))
+            name = name[:i] + rng.choice(string.ascii_lowercase) + name[i:][1:]
+        elif roll < 0.8:
+            name = f"{entry['last']}, {entry['first']}".lower()
+        else:
+            name = f"{_word(rng)} {_word(rng)}"
+        queries.append(name)
+    return queries
+
+
+def match(matcher: FuzzyMatcher, user_input: str) -> str | None:
+    """The forward-then-reversed matching done by StaffLookup.match_faculty."""
+    query = user_input.lower().replace(",", "").strip()
+    for q in [query, " ".join(reversed(query.split()))]:
+        found = matcher.best(q, cutoff=FACULTY_CUTOFF)
+        if found:
+            return found
+    return None
+
+
+def run(names: list[str], queries: list[str], workers: int) -> dict[str, Any]:
+    with FuzzyMatcher(names, workers=workers, threshold=1, warmup=0) as matcher:
+        start = time.perf_counter()
+        if matcher.parallel:
+            matcher.best("warm up", cutoff=FACULTY_CUTOFF)  # starts the pool
+        startup = time.perf_counter() - start
+
+        latencies = []
+        results = []
+        for q in queries:
+            t = time.perf_counter()
+            results.append(match(matcher, q))
+            latencies.append(time.perf_counter() - t)
+
+    latencies.sort()
+    return {
+        "workers": workers,
+        "startup_ms": startup * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "results": results,
+    }
+
+
+@click.command()
+@click.option("--people", default="5000,20000,60000", show_default=True)
+@click.option("--workers", "worker_counts", default=None, help="e.g. 1,2,4")
+@click.option("--queries", "query_count", default=20, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option("--json", "json_path", default=None, help="Write results as JSON.")
+def main(
+    people: str,
+    worker_counts: str | None,
+    query_count: int,
+    seed: int,
+    json_path: str | None,
+) -> None:
+    cpus = available_workers()
+    counts = (
+        [int(w) for w in worker_counts.split(",")]
+        if worker_counts
+        else sorted({1, 2, 4, cpus} - {0})
+    )
+    click.echo(
+        f"{cpus} CPU(s) available to this process (os.cpu_count()={os.cpu_count()})"
+    )
+
+    report = []
+    for n in (int(p) for p in people.split(",")):
+        faculty = build_faculty(n, seed)
+        names = StaffLookup._build_searchable_names(faculty)
+        queries = build_queries(faculty, query_count, seed + 1)
+        click.echo(f"\n{n} people, {len(names)} candidates, {len(queries)} queries")
+        click.echo(
+            f"{'workers':>8} {'start ms':>9} {'mean ms':>9} {'p95 ms':>9}  speedup"
+        )
+
+        baseline: tuple[float, list[str | None]] | None = None
+        for workers in counts:
+            row = run(names, queries, workers)
+            results = row.pop("results")
+            if baseline is None:
+                baseline = (row["mean_ms"], results)
+            elif results != baseline[1]:
+                raise click.ClickException(f"workers={workers} disagrees with serial")
+            speedup = baseline[0] / row["mean_ms"] if row["mean_ms"] else 0.0
+            click.echo(
+                f"{workers:>8} {row['startup_ms']:>9.1f} {row['mean_ms']:>9.1f} "
+                f"{row['p95_ms']:>9.1f}  {speedup:.2f}x"
+            )
+            report.append({"people": n, "candidates": len(names), **row})
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
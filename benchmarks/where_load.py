@@ -0,0 +1,352 @@
+"""
+Load generator for concurrent `where` traffic against a fake wayne.edu.
+
+Starts a local HTTP server that mimics the /people directory search and the
+/people/<id> profile pages with tunable latency, then drives the same staff
+and location lookup path as `wb where` (KnowledgeIndex, plan() and
+where._where_search, with output discarded) from a pool of worker threads. Each run
+reports throughput, latency percentiles per query kind, upstream request
+counts and staff cache hit ratios, so it is easy to see where throughput stops
+growing with concurrency.
+
+The user cache directory is pointed at a temporary directory for the whole
+run (as tests/conftest.py does), so the faculty cache, data files, staff cache,
+query log and knowledge index all start from the bundled data and runs never
+touch (or are sped up by) the user's real cache.
+
+Usage:
+    python benchmarks/where_load.py --concurrency 1,4,16 --queries 400 \\
+        --latency-ms 80 --mix hot=60,cold=20,location=15,miss=5
+"""
+
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.core.where import _where_search
+from warrior_bot.utils.background import BackgroundRefresher
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.faculty_parser import load_faculty_cache
+from warrior_bot.utils.http_pool import HTTPPool
+from warrior_bot.utils.knowledge import KnowledgeIndex
+from warrior_bot.utils.query_log import QueryLog
+from warrior_bot.utils.staff_cache import StaffCache
+from warrior_bot.utils.storage import PACKAGE_DATA_DIR
+
+QUERY_KINDS = ("hot", "cold", "location", "miss")
+MISS_QUERIES = ["zzqx vorpal", "qwerty uiop", "flux capacitor", "blorb"]
+
+
+class FakeWayneServer(ThreadingHTTPServer):
+    """Threaded HTTP server imitating the wayne.edu people pages."""
+
+    daemon_threads = True
+
+    def __init__(self, latency: float, pages: int) -> None:
+        super().__init__(("127.0.0.1", 0), FakeWayneHandler)
+        self.latency = latency
+        self.pages = pages
+        self.hits: Counter[str] = Counter()
+        self.hits_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeWayneHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeWayneServer
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        time.sleep(self.server.latency)
+
+        if parts.path == "/people":
+            kind = "directory"
+            params = parse_qs(parts.query)
+            query = params.get("q", [""])[0]
+            page = int(params.get("page", ["1"])[0])
+            status, body = self._directory(query, page)
+        elif parts.path.startswith("/people/"):
+            kind = "profile"
+            status, body = 200, self._profile(parts.path.rsplit("/", 1)[-1])
+        else:
+            kind = "other"
+            status, body = 404, "<html></html>"
+
+        with self.server.hits_lock:
+            self.server.hits[kind] += 1
+
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _directory(self, query: str, page: int) -> tuple[int, str]:
+        if page > self.server.pages:
+            return 404, "<html></html>"
+        staff_id = f"fk{zlib.crc32(query.encode()) % 100000:05d}"
+        link = f'<a href="/people/{staff_id}/">{query}</a>' if page == 1 else ""
+        return 200, f"<html><body>\n<p>Results</p>\n{link}\n</body></html>"
+
+    def _profile(self, staff_id: str) -> str:
+        return (
+            "<html><body>\n"
+            "<p>Unit: Department of Load Testing</p>\n"
+            f"<p>Office:</p>\n<p>{staff_id[-3:]} Fake Hall</p>\n"
+            f"<p>Email:</p>\n<p>{staff_id}@wayne.edu</p>\n"
+            "<p>Phone:</p>\n<p>313-555-0100</p>\n"
+            "</body></html>"
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _lookup_for(server: FakeWayneServer) -> type[StaffLookup]:
+    class FakeStaffLookup(StaffLookup):
+        DIR_URL = f"{server.base_url}/people?type=people&q="
+        STAFF_URL = f"{server.base_url}/people/"
+
+    return FakeStaffLookup
+
+
+@contextmanager
+def isolated_cache_dir() -> Iterator[str]:
+    """Point appdirs' user cache directory, and so get_cache_dir, at a temp dir."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with mock.patch("appdirs.user_cache_dir", return_value=cache_dir):
+            yield cache_dir
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    """Parse "hot=60,cold=20,..." into integer weights per query kind."""
+    weights: dict[str, int] = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in QUERY_KINDS:
+            raise click.BadParameter(f"unknown query kind: {kind}")
+        weights[kind] = int(weight)
+    return weights
+
+
+def build_queries(
+    count: int, mix: dict[str, int], hot_size: int, seed: int
+) -> list[tuple[str, str]]:
+    """Draw a reproducible list of (kind, query) pairs following the mix."""
+    rng = random.Random(seed)
+    faculty = load_faculty_cache()
+    names = [f"{e['first']} {e['last']}".lower() for e in faculty]
+    rng.shuffle(names)
+    hot, cold = names[:hot_size], names[hot_size:]
+
+    handler = DataHandler(PACKAGE_DATA_DIR, "locations.json")
+    places = [k for k in handler.flat if not k[-1].isdigit()]
+
+    kinds = list(mix)
+    queries: list[tuple[str, str]] = []
+    for _ in range(count):
+        kind = rng.choices(kinds, weights=[mix[k] for k in kinds])[0]
+        if kind == "hot":
+            queries.append((kind, rng.choice(hot)))
+        elif kind == "cold":
+            queries.append((kind, cold.pop() if cold else rng.choice(names)))
+        elif kind == "location":
+            queries.append((kind, rng.choice(places)))
+        else:
+            queries.append((kind, rng.choice(MISS_QUERIES)))
+    return queries
+
+
+def where_once(lookup: StaffLookup, index: KnowledgeIndex, text: str) -> None:
+    """Answer one query exactly the way `wb where` does."""
+    _where_search(text, index, lookup)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def run_load(
+    queries: list[tuple[str, str]], concurrency: int, server: FakeWayneServer
+) -> dict[str, Any]:
+    """Run every query across `concurrency` workers and collect metrics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = StaffCache(os.path.join(tmp, "staff_cache.json"))
+        http = HTTPPool(pool_size=concurrency)
+        refresher = BackgroundRefresher()
+        index = KnowledgeIndex.load(os.path.join(tmp, "knowledge_index.json"))
+        lookup = _lookup_for(server)(
+            cache=cache,
+            refresher=refresher,
+            http=http,
+            store=index,
+            query_log=QueryLog(os.path.join(tmp, "query_log.json")),
+        )
+
+        with server.hits_lock:
+            server.hits.clear()
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors = 0
+        lock = threading.Lock()
+
+        def work(item: tuple[str, str]) -> None:
+            nonlocal errors
+            kind, text = item
+            start = time.perf_counter()
+            try:
+                where_once(lookup, index, text)
+                failed = False
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[kind].append(elapsed)
+                errors += failed
+
+        wall_start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(work, queries))
+        wall = time.perf_counter() - wall_start
+        refresher.wait()
+        http.close()
+
+        reads = sum(cache.stats.values())
+        every = [x for samples in latencies.values() for x in samples]
+        return {
+            "concurrency": concurrency,
+            "queries": len(queries),
+            "errors": errors,
+            "wall_s": wall,
+            "throughput_qps": len(queries) / wall if wall else 0.0,
+            "latency_ms": _latency_summary(every),
+            "latency_ms_by_kind": {
+                k: _latency_summary(v) for k, v in sorted(latencies.items())
+            },
+            "http_requests": dict(server.hits),
+            "http_connections": http.connections,
+            "cache_reads": dict(cache.stats),
+            "cache_hit_ratio": (
+                (cache.stats["hit"] + cache.stats["stale"] + cache.stats["negative"])
+                / reads
+                if reads
+                else 0.0
+            ),
+        }
+
+
+def _latency_summary(samples: list[float]) -> dict[str, float]:
+    ms = [s * 1000 for s in samples]
+    return {
+        "mean": statistics.fmean(ms) if ms else 0.0,
+        "p50": percentile(ms, 50),
+        "p90": percentile(ms, 90),
+        "p99": percentile(ms, 99),
+        "max": max(ms, default=0.0),
+    }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    lat = report["latency_ms"]
+    click.echo(
+        click.style(f"concurrency {report['concurrency']}", fg="green", bold=True)
+        + f"  {report['throughput_qps']:.1f} q/s"
+        + f"  p50 {lat['p50']:.1f}ms  p90 {lat['p90']:.1f}ms"
+        + f"  p99 {lat['p99']:.1f}ms  max {lat['max']:.1f}ms"
+        + f"  errors {report['errors']}"
+    )
+    for kind, k_lat in report["latency_ms_by_kind"].items():
+        click.echo(
+            f"    {kind:<9} p50 {k_lat['p50']:8.1f}ms  p99 {k_lat['p99']:8.1f}ms"
+        )
+    hits = ", ".join(f"{k}={v}" for k, v in sorted(report["http_requests"].items()))
+    click.echo(
+        f"    http: {hits or 'none'} over {report['http_connections']} connections"
+    )
+    click.echo(
+        f"    staff cache hit ratio {report['cache_hit_ratio']:.1%} "
+        f"({report['cache_reads']})"
+    )
+
+
+@click.command()
+@click.option(
+    "--concurrency",
+    default="1,4,16",
+    show_default=True,
+    help="Comma separated worker counts; one run per value.",
+)
+@click.option("--queries", default=300, show_default=True, help="Queries per run.")
+@click.option(
+    "--mix",
+    default="hot=60,cold=20,location=15,miss=5",
+    show_default=True,
+    help="Relative weights of hot, cold, location and miss queries.",
+)
+@click.option("--hot-size", default=20, show_default=True, help="Hot name count.")
+@click.option(
+    "--latency-ms", default=50.0, show_default=True, help="Fake server latency."
+)
+@click.option(
+    "--pages", default=5, show_default=True, help="Directory pages per search."
+)
+@click.option("--seed", default=0, show_default=True)
+@click.option("--json", "json_path", default=None, help="Also write a JSON report.")
+def main(
+    concurrency: str,
+    queries: int,
+    mix: str,
+    hot_size: int,
+    latency_ms: float,
+    pages: int,
+    seed: int,
+    json_path: str | None,
+) -> None:
+    """Drive concurrent `where` lookups against a fake wayne.edu."""
+    server = FakeWayneServer(latency_ms / 1000, pages)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    reports: list[dict[str, Any]] = []
+    try:
+        with isolated_cache_dir():
+            workload = build_queries(queries, parse_mix(mix), hot_size, seed)
+            for level in (int(c) for c in concurrency.split(",")):
+                report = run_load(workload, level, server)
+                reports.append(report)
+                _print_report(report)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import os
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Generator
+
+import pytest
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils import faculty_parser
+from warrior_bot.utils.staff_cache import StaffCache
+from warrior_bot.utils.storage import PACKAGE_DATA_DIR
+
+FACULTY_FILE = os.path.join(PACKAGE_DATA_DIR, "faculty_cache.json")
+
+Serve = Callable[[type[BaseHTTPRequestHandler]], str]
+
+
+@pytest.fixture(autouse=True)
+def user_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    """Point the appdirs user cache directory at a per-test temporary directory.
+
+    Everything warrior-bot publishes or seeds (staff cache, faculty cache,
+    synced data files, indexes) goes through storage.get_cache_dir, so no test
+    reads from or writes to the developer's real cache.
+    """
+    cache_dir = tmp_path_factory.mktemp("user_cache")
+    monkeypatch.setattr(
+        "appdirs.user_cache_dir", lambda *args, **kwargs: str(cache_dir)
+    )
+    return cache_dir
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> StaffCache:
+    """Empty staff lookup cache in a per-test file."""
+    return StaffCache(str(tmp_path / "staff_cache.json"))
+
+
+@pytest.fixture
+def http_server() -> Generator[Serve, None, None]:
+    """Start local HTTP servers for handler classes; returns each one's base URL.
+
+    Servers answer on an ephemeral 127.0.0.1 port from a daemon thread and are
+    shut down when the test finishes.
+    """
+    servers: list[ThreadingHTTPServer] = []
+
+    def serve(handler: type[BaseHTTPRequestHandler]) -> str:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def handler() -> DataHandler:
+    """DataHandler over the bundled locations.json."""
+    return DataHandler(PACKAGE_DATA_DIR, "locations.json")
+
+
+@pytest.fixture(scope="session")
+def faculty() -> list[dict[str, str | None]]:
+    """Entries of the bundled faculty cache."""
+    return faculty_parser.load_faculty_cache(FACULTY_FILE)
+
+
+def _typo(text: str, rng: random.Random) -> str:
+    if len(text) < 4:
+        return text
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice("aeiourst") + text[i:][1:]
+
+
+@pytest.fixture
+def typo() -> Callable[[str, random.Random], str]:
+    """Replace one random character of a string (strings under 4 are kept)."""
+    return _typo
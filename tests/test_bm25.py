@@ -0,0 +1,74 @@
+import pytest
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils.bm25 import BM25Index, tokenize
+
+
+def test_tokenize_drops_stopwords() -> None:
+    assert tokenize("Where is the Panda-Express?") == ["panda", "express"]
+
+
+def test_ranks_by_term_rarity_and_requires_all_indexed_terms() -> None:
+    index = BM25Index(
+        [
+            ("gym", "recreation center with pool and gym"),
+            ("library", "library study rooms"),
+            ("market", "market in the student center"),
+        ]
+    )
+    assert index.best("study rooms") == "library"
+    assert index.best("student center") == "market"
+    assert index.best("studnet center") == "market"  # corrected to "student"
+    assert index.best("pool rooms") is None  # no document has both terms
+    assert index.best("pool") is None  # single terms are left to fuzzy matching
+    assert index.best("quiet study rooms") == "library"  # "quiet" is dropped
+    assert index.best("rec pool") == "gym"  # "rec" completes to "recreation"
+
+
+def test_multi_word_queries_reach_values(handler: DataHandler) -> None:
+    assert handler.search("reservable rooms") == (
+        "Multiple levels with reservable rooms"
+    )
+    assert "pool and gym" in (handler.search("gym and pool") or "")
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("quiet study rooms", "Multiple levels with reservable rooms"),
+        ("pool tables", "Behind the Student Center, includes pool and gym"),
+        ("rec center", "Mort Harris Recreation and Fitness Center"),
+    ],
+)
+def test_unknown_terms_are_dropped(
+    handler: DataHandler, query: str, expected: str
+) -> None:
+    assert handler.bm25.best(query) is not None
+    assert (handler.search(query) or "").startswith(expected)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "music hall",
+        "computer science",
+        "honors college",
+        "game room",
+        "career services",
+        "quiet place",
+        "tutoring center",
+    ],
+)
+def test_one_generic_or_guessed_word_is_not_a_match(
+    handler: DataHandler, query: str
+) -> None:
+    assert handler.bm25.best(query) is None
+    assert handler.search(query) is None
+
+
+def test_exact_and_single_word_matches_unchanged(handler: DataHandler) -> None:
+    for key, value in handler.flat.items():
+        normalized = key.lower().replace("_", " ")
+        if handler.normalized[normalized] == key:
+            assert handler.search(key) == value, key
+    assert handler.bm25.best("ugl") is None
@@ -0,0 +1,116 @@
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable
+
+import pytest
+from bs4 import BeautifulSoup
+
+from warrior_bot.utils import staff_cache
+from warrior_bot.utils.background import BackgroundRefresher
+from warrior_bot.utils.budget import Budget, BudgetExceeded
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.http_pool import HTTPPool
+from warrior_bot.utils.staff_cache import StaffCache
+
+DIR_PAGE = '<a href="/people/ab1234">Abbey, Antonia</a>'
+PROFILE_PAGE = "<p>Unit: Psychology</p>"
+
+
+class SlowLookup(StaffLookup):
+    def __init__(self, cache: StaffCache, budget: Budget, delay: float = 0) -> None:
+        super().__init__(cache, refresher=BackgroundRefresher(), budget=budget)
+        self.delay = delay
+        self.fetches = 0
+
+    def _fetch_soup_dir(self, query: str) -> BeautifulSoup:
+        self.fetches += 1
+        time.sleep(self.delay)
+        return BeautifulSoup(DIR_PAGE, features="html.parser")
+
+    def _fetch_soup_staff(self, query: str) -> BeautifulSoup:
+        self.fetches += 1
+        time.sleep(self.delay)
+        return BeautifulSoup(PROFILE_PAGE, features="html.parser")
+
+
+def test_offline_answers_from_cache_only(cache: StaffCache) -> None:
+    online = SlowLookup(cache, Budget())
+    assert online.resolve_query_to_name_and_id("Antonia Abbey") == [
+        ("abbey antonia", "ab1234")
+    ]
+    assert online.resolve_id_to_profile("ab1234") is not None
+
+    offline = SlowLookup(cache, Budget(offline=True))
+    assert offline.resolve_query_to_name_and_id("Antonia Abbey") == [
+        ("abbey antonia", "ab1234")
+    ]
+    profile = offline.resolve_id_to_profile("ab1234")
+    assert profile is not None and profile.department == "Psychology"
+
+    assert offline.resolve_query_to_name_and_id("Someone Else") == []
+    assert offline.resolve_id_to_profile("zz9999") is None
+    assert offline.fetches == 0
+    assert offline.budget is not None
+    assert offline.budget.notes() == [
+        "Skipped staff directory lookup (offline).",
+        "Skipped staff profile lookup (offline).",
+    ]
+
+
+def test_budget_cancels_slow_network_stage(cache: StaffCache) -> None:
+    budget = Budget(seconds=0.1)
+    lookup = SlowLookup(cache, budget, delay=2)
+
+    start = time.monotonic()
+    assert lookup.resolve_query_to_name_and_id("Antonia Abbey") == []
+    assert time.monotonic() - start < 1
+    assert budget.was_skipped(lookup.DIRECTORY_STAGE)
+
+    # Once the budget is spent later stages are skipped without starting.
+    assert lookup.resolve_id_to_profile("ab1234") is None
+    assert lookup.fetches == 1
+    assert budget.skipped[-1] == (lookup.PROFILE_STAGE, "time budget spent")
+
+
+def test_stale_entries_are_not_refreshed_under_a_budget(
+    cache: StaffCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    SlowLookup(cache, Budget()).resolve_id_to_profile("ab1234")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.POSITIVE_TTL + 1)
+
+    budget = Budget(seconds=5)
+    lookup = SlowLookup(cache, budget)
+    profile = lookup.resolve_id_to_profile("ab1234")
+    assert profile is not None and profile.stale
+    assert lookup.refresher.pending() == 0
+    assert budget.was_skipped(lookup.REFRESH_STAGE)
+
+
+def test_failures_become_notes() -> None:
+    budget = Budget(seconds=5)
+
+    def unreachable() -> None:
+        raise OSError("connection refused")
+
+    with pytest.raises(BudgetExceeded):
+        budget.run("directory", unreachable)
+    assert budget.notes() == ["Skipped directory (failed: connection refused)."]
+
+
+class StallingHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        time.sleep(1)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def test_pool_requests_time_out(
+    http_server: Callable[[type[BaseHTTPRequestHandler]], str],
+) -> None:
+    url = http_server(StallingHandler)
+    pool = HTTPPool(timeout=0.1)
+    with pytest.raises(OSError):
+        pool.get(f"{url}/people/ab1234")
+    pool.close()
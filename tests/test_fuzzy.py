@@ -0,0 +1,76 @@
+import random
+import string
+from difflib import get_close_matches
+
+import pytest
+
+from warrior_bot.utils.fuzzy import FuzzyMatcher, shared_matcher
+
+
+def _names(n: int, rng: random.Random) -> list[str]:
+    def word() -> str:
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+
+    return [f"{word()} {word()}" for _ in range(n)]
+
+
+def test_serial_and_parallel_match_difflib() -> None:
+    rng = random.Random(0)
+    names = _names(3000, rng)
+    names += names[:50]  # duplicates, as the searchable names contain
+    queries = [rng.choice(names) for _ in range(10)] + ["zz", "", "qqqq qqqq"]
+    queries += [q[:-1] + "x" for q in queries[:10]]
+
+    serial = FuzzyMatcher(names, workers=1)
+    assert not serial.parallel
+    with FuzzyMatcher(names, workers=2, threshold=1, warmup=0) as parallel:
+        assert parallel.parallel
+        for query in queries:
+            for cutoff in (0.6, 0.8):
+                expected = get_close_matches(query, names, n=1, cutoff=cutoff)
+                want = expected[0] if expected else None
+                assert serial.best(query, cutoff) == want, query
+                assert parallel.best(query, cutoff) == want, query
+
+
+def test_parallel_mode_is_chosen_by_candidate_count() -> None:
+    assert not FuzzyMatcher(["a"] * 10, workers=4, threshold=100, warmup=0).parallel
+    assert FuzzyMatcher(["a"] * 100, workers=4, threshold=100, warmup=0).parallel
+
+
+def test_pool_waits_until_serial_work_would_pay_for_it() -> None:
+    matcher = FuzzyMatcher(["ann lee"] * 100, workers=4, threshold=100, warmup=200)
+    for _ in range(2):  # A one-shot command's queries stay serial.
+        assert not matcher.parallel
+        assert matcher.best("ann le") == "ann lee"
+    assert matcher._pool is None
+    assert matcher.parallel
+
+
+def test_shared_matcher_is_reused_for_equal_candidates() -> None:
+    with shared_matcher(["ann lee", "bo chen"]) as first:
+        pass
+    with shared_matcher(["ann lee", "bo chen"]) as again:
+        assert again is first
+    with shared_matcher(["ann lee"]) as other:
+        assert other is not first
+    assert first._closed
+
+
+def test_retired_matcher_stays_open_until_its_users_leave() -> None:
+    with shared_matcher(["ann lee", "bo chen"]) as old:
+        old.workers, old.threshold, old.warmup = 2, 1, 0
+        assert old.best("ann le") == "ann lee"  # pool started
+        with shared_matcher(["cy diaz"]) as new:
+            assert new is not old
+            # Another thread replaced the candidates mid-query: still usable.
+            assert old.best("bo chn") == "bo chen"
+        assert not old._closed
+    assert old._closed and old._pool is None
+
+
+def test_closed_matcher_never_restarts_its_pool() -> None:
+    matcher = FuzzyMatcher(["ann lee"], workers=2, threshold=1, warmup=0)
+    matcher.close()
+    with pytest.raises(RuntimeError):
+        matcher.best("ann lee")
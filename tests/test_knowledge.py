@@ -0,0 +1,100 @@
+import json
+import os
+import random
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils import faculty_parser, knowledge
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.knowledge import (
+    KnowledgeIndex,
+    KnowledgeSource,
+    Record,
+    location_records,
+    person_records,
+)
+from warrior_bot.utils.staff_cache import StaffCache
+
+
+@pytest.fixture(scope="module")
+def index(handler: DataHandler, faculty: list[dict[str, str | None]]) -> KnowledgeIndex:
+    return KnowledgeIndex(location_records(handler.snapshot) + person_records(faculty))
+
+
+def test_place_search_matches_data_handler(
+    handler: DataHandler,
+    index: KnowledgeIndex,
+    typo: Callable[[str, random.Random], str],
+) -> None:
+    rng = random.Random(0)
+    queries = ["", "ugl", "UGL", "pool", "student_center", "zzzz", "fac"]
+    for key in handler.flat:
+        words = key.lower().split()
+        queries += [key, words[-1], " ".join(words[-2:]), typo(key, rng)]
+
+    for query in queries:
+        assert index.search(query) == handler.search(query), query
+
+
+def test_person_match_matches_staff_lookup(
+    faculty: list[dict[str, str | None]],
+    index: KnowledgeIndex,
+    monkeypatch: pytest.MonkeyPatch,
+    cache: StaffCache,
+    typo: Callable[[str, random.Random], str],
+) -> None:
+    monkeypatch.setattr(faculty_parser, "load_faculty_cache", lambda: faculty)
+    lookup = StaffLookup(cache=cache)
+
+    rng = random.Random(1)
+    queries = ["", "panda express", "student center", "smith", "xq"]
+    for entry in rng.sample(faculty, 40):
+        first, last = entry["first"] or "", entry["last"] or ""
+        queries += [f"{first} {last}", f"{last}, {first}", typo(first + last, rng)]
+
+    for query in queries:
+        assert index.match_faculty(query) == lookup.match_faculty(query), query
+
+
+def test_query_follows_command_plan(index: KnowledgeIndex) -> None:
+    assert [r.kind for r in index.query("go", "campus-map")] == ["link"]
+    assert index.query("go", "campus-map")[0].value == "https://maps.wayne.edu"
+    assert [r.kind for r in index.query("what", "student center")] == ["place"]
+    assert index.query("whois", "zzzz qqqq") == []
+
+
+def test_load_reuses_persisted_records(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    data_file = os.path.join(tmp_path, "links.json")
+    with open(data_file, "w") as f:
+        json.dump({"website": "https://wayne.edu"}, f)
+
+    loads = []
+
+    def load() -> list[Record]:
+        loads.append(1)
+        with open(data_file) as f:
+            return [Record("link", k, k, v, "links") for k, v in json.load(f).items()]
+
+    monkeypatch.setattr(
+        knowledge,
+        "SOURCES",
+        {"links": KnowledgeSource("links", lambda: [data_file], load)},
+    )
+    index_path = os.path.join(tmp_path, "index.json")
+
+    assert KnowledgeIndex.load(index_path).best("link", "website") is not None
+    assert KnowledgeIndex.load(index_path).best("link", "website") is not None
+    assert len(loads) == 1
+
+    with open(data_file, "w") as f:
+        json.dump({"website": "https://wayne.edu", "map": "https://maps"}, f)
+    os.utime(data_file, ns=(0, 1))
+
+    reloaded = KnowledgeIndex.load(index_path)
+    assert len(loads) == 2
+    assert [r.key for r in reloaded.records("link")] == ["website", "map"]
@@ -0,0 +1,31 @@
+import json
+import sys
+
+from warrior_bot.utils.memory import collect_memory_report, deep_sizeof
+
+
+def test_deep_sizeof_follows_containers() -> None:
+    inner = ["x" * 1000]
+    outer = {"a": inner, "b": inner}
+
+    assert deep_sizeof(outer) > sys.getsizeof(outer) + 1000
+    # Shared objects are only counted once within one structure.
+    assert deep_sizeof(outer) < deep_sizeof({"a": inner, "b": ["y" * 1000]})
+
+
+def test_report_measures_loaded_structures() -> None:
+    payload = {str(i): str(i) * 100 for i in range(50)}
+
+    report = collect_memory_report(top=3, loader=lambda: {"payload": (payload, 50)})
+
+    (usage,) = report.structures
+    assert usage.name == "payload" and usage.entries == 50
+    assert usage.bytes >= 50 * 100
+    assert len(report.top_allocations) <= 3
+    assert json.loads(json.dumps(report.to_dict()))["structures"][0]["entries"] == 50
+
+
+def test_default_report_covers_where_working_set() -> None:
+    names = {s.name for s in collect_memory_report(top=1).structures}
+
+    assert {"locations.flat", "locations.bm25", "knowledge_index"} <= names
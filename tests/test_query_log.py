@@ -0,0 +1,24 @@
+from pathlib import Path
+
+from warrior_bot.utils.query_log import QueryLog
+
+
+def test_top_orders_by_count(tmp_path: Path) -> None:
+    log = QueryLog(str(tmp_path / "log.json"))
+    for _ in range(3):
+        log.record("Resh Mahabir", "resh mahabir", "ab1111")
+    log.record("Antonia Abbey", "antonia abbey", "ab2222")
+
+    top = log.top(5)
+    assert [e.staff_id for e in top] == ["ab1111", "ab2222"]
+    assert top[0].count == 3 and top[0].query == "Resh Mahabir"
+
+
+def test_rotates_out_least_used(tmp_path: Path) -> None:
+    log = QueryLog(str(tmp_path / "log.json"), max_entries=2)
+    log.record("A A", "a a", "id-a")
+    log.record("A A", "a a", "id-a")
+    log.record("B B", "b b", "id-b")
+    log.record("C C", "c c", "id-c")
+
+    assert {e.staff_id for e in log.top(10)} == {"id-a", "id-c"}
@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from warrior_bot.core.data_handler import LocationSnapshot, ReloadingDataHandler
+from warrior_bot.utils.storage import PACKAGE_DATA_DIR
+
+NEW_SPOT = "Room 42, Test Hall"
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> str:
+    shutil.copy(os.path.join(PACKAGE_DATA_DIR, "locations.json"), tmp_path)
+    return str(tmp_path)
+
+
+@pytest.fixture
+def handler(data_dir: str) -> Generator[ReloadingDataHandler, None, None]:
+    # Long interval: tests drive check() themselves unless they poll.
+    with ReloadingDataHandler(data_dir, "locations.json", interval=60) as h:
+        yield h
+
+
+def _edit(path: str, text: str | None = None) -> None:
+    if text is None:
+        with open(path) as f:
+            data = json.load(f)
+        data["test_spot"] = NEW_SPOT
+        text = json.dumps(data)
+    mtime_ns = os.stat(path).st_mtime_ns
+    with open(path, "w") as f:
+        f.write(text)
+    # Filesystem timestamps can be coarse; make sure the edit is visible.
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def test_edits_are_picked_up(handler: ReloadingDataHandler) -> None:
+    assert handler.search("test spot") != NEW_SPOT
+    assert not handler.check()
+
+    _edit(handler.path)
+    assert handler.check()
+    assert handler.search("test spot") == NEW_SPOT
+    assert handler.reloads == 1
+    assert not handler.check()
+
+
+def test_touch_without_edit_keeps_indexes(handler: ReloadingDataHandler) -> None:
+    before = handler.snapshot
+    stat = os.stat(handler.path)
+    os.utime(handler.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert not handler.check()
+    assert handler.bm25 is before.bm25
+    assert handler.snapshot.signature[0] == stat.st_mtime_ns + 10**9
+    assert handler.reloads == 0
+
+
+def test_broken_file_keeps_serving(handler: ReloadingDataHandler) -> None:
+    expected = handler.search("student center")
+    _edit(handler.path, '{"half": "writ')
+
+    assert not handler.check()
+    assert isinstance(handler.last_error, ValueError)
+    assert handler.search("student center") == expected
+
+    _edit(handler.path, json.dumps({"test_spot": NEW_SPOT}))
+    assert handler.check()
+    assert handler.last_error is None
+    assert handler.search("test spot") == NEW_SPOT
+
+
+def test_searches_do_not_wait_for_rebuild(
+    handler: ReloadingDataHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = handler.search("student center")
+    building = threading.Event()
+    release = threading.Event()
+    build = handler._build
+
+    def slow_build(*args: Any) -> LocationSnapshot:
+        building.set()
+        release.wait(5)
+        return build(*args)
+
+    monkeypatch.setattr(handler, "_build", slow_build)
+    _edit(handler.path)
+    reload = threading.Thread(target=handler.check)
+    reload.start()
+    assert building.wait(5)
+
+    start = time.monotonic()
+    assert handler.search("student center") == expected
+    assert handler.search("test spot") != NEW_SPOT
+    assert time.monotonic() - start < 1
+
+    release.set()
+    reload.join()
+    assert handler.search("test spot") == NEW_SPOT
+
+
+def test_background_polling(data_dir: str) -> None:
+    with ReloadingDataHandler(data_dir, "locations.json", interval=0.05) as handler:
+        _edit(handler.path)
+        deadline = time.monotonic() + 5
+        while handler.reloads == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert handler.search("test spot") == NEW_SPOT
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable
+
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.http_pool import HTTPPool
+from warrior_bot.utils.single_flight import SingleFlight
+from warrior_bot.utils.staff_cache import StaffCache
+
+CALLERS = 8
+
+
+def test_concurrent_threads_share_one_call() -> None:
+    flights = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(CALLERS)
+
+    def work() -> list[str]:
+        calls.append(1)
+        time.sleep(0.2)
+        return ["result"]
+
+    def caller() -> list[str]:
+        barrier.wait()
+        return flights.do("key", work)
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = list(pool.map(lambda _: caller(), range(CALLERS)))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats == Counter(leader=1, shared=CALLERS - 1)
+    assert flights.in_flight() == 0
+
+    # The key is forgotten once the flight lands.
+    flights.do("key", work)
+    assert len(calls) == 2
+
+
+def test_errors_reach_every_waiter() -> None:
+    flights = SingleFlight()
+    barrier = threading.Barrier(CALLERS)
+
+    def work() -> None:
+        time.sleep(0.2)
+        raise OSError("connection refused")
+
+    def caller() -> str:
+        barrier.wait()
+        try:
+            flights.do("key", work)
+        except OSError as e:
+            return str(e)
+        return "no error"
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        errors = list(pool.map(lambda _: caller(), range(CALLERS)))
+
+    assert errors == ["connection refused"] * CALLERS
+    assert flights.stats["leader"] == 1
+
+
+def test_coroutines_share_one_call() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    def work() -> str:
+        calls.append(1)
+        time.sleep(0.2)
+        return "result"
+
+    async def main() -> list[str]:
+        return await asyncio.gather(
+            *(flights.do_async("key", work) for _ in range(CALLERS))
+        )
+
+    assert asyncio.run(main()) == ["result"] * CALLERS
+    assert len(calls) == 1
+
+    # A coroutine joins a flight a thread started.
+    thread = threading.Thread(target=flights.do, args=("key", work))
+    thread.start()
+    while not flights.in_flight():
+        time.sleep(0.01)
+    assert asyncio.run(flights.do_async("key", work)) == "result"
+    thread.join()
+    assert len(calls) == 2
+
+
+class SlowDirectoryHandler(BaseHTTPRequestHandler):
+    """wayne.edu stand-in: one directory page, one profile, 200 ms latency."""
+
+    hits: Counter[str] = Counter()
+
+    def do_GET(self) -> None:
+        time.sleep(0.2)
+        if self.path.startswith("/people?"):
+            if not self.path.endswith("&page=1"):
+                self.send_error(404)
+                return
+            self.hits["directory"] += 1
+            body = '<a href="/people/ab1234">Abbey, Antonia</a>'
+        else:
+            self.hits["profile"] += 1
+            body = "<p>Unit: Psychology</p>"
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def test_concurrent_lookups_hit_wayne_edu_once(
+    http_server: Callable[[type[BaseHTTPRequestHandler]], str], cache: StaffCache
+) -> None:
+    SlowDirectoryHandler.hits = Counter()
+    base_url = http_server(SlowDirectoryHandler)
+
+    class LocalLookup(StaffLookup):
+        DIR_URL = f"{base_url}/people?type=people&q="
+        STAFF_URL = f"{base_url}/people/"
+
+    flights = SingleFlight()
+    http = HTTPPool()
+    barrier = threading.Barrier(CALLERS)
+
+    def resolve(i: int) -> tuple[list[tuple[str, str]], str | None]:
+        lookup = LocalLookup(cache, http=http, flights=flights)
+        # Differently spelled but identical queries share the flight too.
+        query = "Antonia Abbey" if i % 2 else "  antonia   ABBEY"
+        barrier.wait()
+        found = lookup.resolve_query_to_name_and_id(query)
+        barrier.wait()
+        profile = lookup.resolve_id_to_profile("ab1234")
+        return found, profile.department if profile else None
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        results = list(pool.map(resolve, range(CALLERS)))
+    http.close()
+
+    assert results == [([("abbey antonia", "ab1234")], "Psychology")] * CALLERS
+    assert SlowDirectoryHandler.hits == Counter(directory=1, profile=1)
+    assert flights.stats == Counter(leader=2, shared=2 * (CALLERS - 1))
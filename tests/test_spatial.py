@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils.knowledge import KnowledgeIndex, location_records
+from warrior_bot.utils.spatial import SpatialIndex, haversine_m
+
+
+@pytest.fixture(scope="module")
+def index(handler: DataHandler) -> KnowledgeIndex:
+    return KnowledgeIndex(location_records(handler.snapshot))
+
+
+def test_nearest_matches_brute_force() -> None:
+    rng = random.Random(0)
+    points = [
+        (42.35 + rng.uniform(-0.02, 0.02), -83.07 + rng.uniform(-0.02, 0.02), i)
+        for i in range(2000)
+    ]
+    # Coincident points must still come back in input order.
+    points += [(points[0][0], points[0][1], 2000 + i) for i in range(3)]
+    tree = SpatialIndex(points)
+
+    for _ in range(50):
+        lat = 42.35 + rng.uniform(-0.03, 0.03)
+        lon = -83.07 + rng.uniform(-0.03, 0.03)
+        k = rng.choice([1, 5, 20])
+        expected = sorted(
+            points, key=lambda p: (haversine_m(lat, lon, p[0], p[1]), p[2])
+        )[:k]
+        found = tree.nearest(lat, lon, k)
+        assert [item for _, item in found] == [p[2] for p in expected]
+
+    even = tree.nearest(42.35, -83.07, 10, accept=lambda i: i % 2 == 0)
+    assert len(even) == 10 and all(i % 2 == 0 for _, i in even)
+
+
+def test_empty_index() -> None:
+    assert SpatialIndex([]).nearest(42.35, -83.07) == []
+
+
+def test_nearest_food_to_old_main(index: KnowledgeIndex) -> None:
+    anchor = index.locate("old main")
+    assert anchor is not None and anchor.lat is not None
+
+    food = index.nearest(anchor, 3, "food")
+    assert [r.key for _, r in food] == ["panda express", "taco bell", "starbucks"]
+    assert all(d > 0 for d, _ in food)
+
+    nearby = index.nearest(anchor, 5)
+    assert anchor.value not in [r.value for _, r in nearby]
+    assert [d for d, _ in nearby] == sorted(d for d, _ in nearby)
+
+
+def test_unknown_type_and_codes(index: KnowledgeIndex) -> None:
+    anchor = index.locate("UGL")
+    assert anchor is not None and anchor.label == "UGLB"
+    assert index.nearest(anchor, 3, "pizza") == []
+    assert "study spaces" in index.place_types()
@@ -0,0 +1,76 @@
+import os
+import random
+from pathlib import Path
+from typing import Callable, Generator
+
+import pytest
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils import faculty_parser
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.sqlite_store import SQLiteStore, build_store
+from warrior_bot.utils.staff_cache import StaffCache
+
+
+@pytest.fixture(scope="module")
+def store(
+    handler: DataHandler,
+    faculty: list[dict[str, str | None]],
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Generator[SQLiteStore, None, None]:
+    path = build_store(
+        handler.snapshot, faculty, str(tmp_path_factory.mktemp("db") / "wb.sqlite3")
+    )
+    store = SQLiteStore(path)
+    yield store
+    store.close()
+
+
+def _location_queries(
+    handler: DataHandler, typo: Callable[[str, random.Random], str]
+) -> list[str]:
+    rng = random.Random(0)
+    queries = ["", "ugl", "UGL", "ub", "pool", "student_center", "zzzz", "fac"]
+    queries += ["pool tables", "quiet study rooms", "studnet center", "a the"]
+    for key, value in handler.flat.items():
+        words = key.lower().split()
+        queries += [key, " ".join(words[-2:]), words[-1], value, typo(key, rng)]
+        queries.append(" ".join(words[: max(1, len(words) // 2)]))
+    return queries
+
+
+def test_location_search_matches_json(
+    handler: DataHandler, store: SQLiteStore, typo: Callable[[str, random.Random], str]
+) -> None:
+    for query in _location_queries(handler, typo):
+        assert store.search(query) == handler.search(query), query
+
+
+def test_faculty_match_matches_json(
+    faculty: list[dict[str, str | None]],
+    store: SQLiteStore,
+    monkeypatch: pytest.MonkeyPatch,
+    cache: StaffCache,
+    typo: Callable[[str, random.Random], str],
+) -> None:
+    monkeypatch.setattr(faculty_parser, "load_faculty_cache", lambda: faculty)
+    json_lookup = StaffLookup(cache=cache)
+
+    rng = random.Random(1)
+    sample = rng.sample(faculty, 40)
+    queries = ["", "panda express", "student center", "smith", "xq"]
+    for entry in sample:
+        first, last = entry["first"] or "", entry["last"] or ""
+        queries += [
+            f"{first} {last}",
+            f"{last}, {first}",
+            typo(f"{first} {last}", rng),
+        ]
+
+    for query in queries:
+        assert store.match_faculty(query) == json_lookup.match_faculty(query), query
+
+
+def test_missing_database_raises(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        SQLiteStore(os.path.join(tmp_path, "missing.sqlite3"))
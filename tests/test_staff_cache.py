@@ -0,0 +1,241 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Callable
+
+import pytest
+from bs4 import BeautifulSoup
+
+from warrior_bot.utils import staff_cache
+from warrior_bot.utils.background import BackgroundRefresher
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.staff_cache import StaffCache
+
+EMPTY_DIR_PAGE = "<html><body><p>No results</p></body></html>"
+EMPTY_PROFILE_PAGE = "<html><body><h1>Someone</h1></body></html>"
+
+
+class CountingLookup(StaffLookup):
+    def __init__(self, cache: StaffCache) -> None:
+        super().__init__(cache)
+        self.dir_calls = 0
+        self.staff_calls = 0
+
+    def _fetch_soup_dir(self, query: str) -> BeautifulSoup:
+        self.dir_calls += 1
+        return BeautifulSoup(EMPTY_DIR_PAGE, features="html.parser")
+
+    def _fetch_soup_staff(self, query: str) -> BeautifulSoup:
+        self.staff_calls += 1
+        return BeautifulSoup(EMPTY_PROFILE_PAGE, features="html.parser")
+
+
+def test_name_miss_skips_directory_fetch(cache: StaffCache) -> None:
+    lookup = CountingLookup(cache)
+
+    assert lookup.resolve_user_input_to_name_and_id("antonia abbey") == []
+    assert lookup.resolve_user_input_to_name_and_id("antonia abbey") == []
+    assert lookup.dir_calls == 1
+
+    # A fresh process reading the same file also trusts the miss.
+    other = CountingLookup(StaffCache(cache.path))
+    assert other.resolve_user_input_to_name_and_id("abbey antonia") == []
+    assert other.dir_calls == 0
+
+
+def test_empty_profile_skips_profile_fetch(cache: StaffCache) -> None:
+    lookup = CountingLookup(cache)
+
+    assert lookup.resolve_id_to_profile("ab1234") is None
+    assert lookup.resolve_id_to_profile("ab1234") is None
+    assert lookup.staff_calls == 1
+
+
+def test_misses_expire(cache: StaffCache, monkeypatch: pytest.MonkeyPatch) -> None:
+    lookup = CountingLookup(cache)
+    lookup.resolve_id_to_profile("ab1234")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.NEGATIVE_TTL + 1)
+    lookup.resolve_id_to_profile("ab1234")
+    assert lookup.staff_calls == 2
+
+
+def test_failed_fetch_is_not_cached(cache: StaffCache) -> None:
+    class OfflineLookup(CountingLookup):
+        def _fetch_soup_dir(self, query: str) -> BeautifulSoup:
+            self.dir_calls += 1
+            return BeautifulSoup("", features="html.parser")
+
+    lookup = OfflineLookup(cache)
+    lookup.resolve_user_input_to_name_and_id("antonia abbey")
+    lookup.resolve_user_input_to_name_and_id("antonia abbey")
+    assert lookup.dir_calls == 2
+
+
+PROFILE_PAGE = (
+    "<html><body>\n<p>Unit: Computer Science</p>\n"
+    "<p>Email:</p>\n<p>ab1234@wayne.edu</p>\n</body></html>"
+)
+
+
+def test_stale_profile_served_then_refreshed(
+    cache: StaffCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    refresher = BackgroundRefresher()
+
+    class ProfileLookup(CountingLookup):
+        def _fetch_soup_staff(self, query: str) -> BeautifulSoup:
+            self.staff_calls += 1
+            return BeautifulSoup(PROFILE_PAGE, features="html.parser")
+
+    lookup = ProfileLookup(cache)
+    lookup.refresher = refresher
+    first = lookup.resolve_id_to_profile("ab1234")
+    assert first is not None and not first.stale
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.POSITIVE_TTL + 1)
+
+    stale = lookup.resolve_id_to_profile("ab1234")
+    assert stale is not None and stale.stale
+    assert stale.department == "Computer Science"
+
+    refresher.wait()
+    assert lookup.staff_calls == 2
+    fresh = lookup.resolve_id_to_profile("ab1234")
+    assert fresh is not None and not fresh.stale
+
+
+def test_refresher_limits_concurrency() -> None:
+    refresher = BackgroundRefresher(max_concurrent=1)
+    release = threading.Event()
+
+    assert refresher.schedule("a", release.wait)
+    assert not refresher.schedule("a", release.wait)
+    assert not refresher.schedule("b", release.wait)
+
+    release.set()
+    refresher.wait()
+    assert refresher.pending() == 0
+    assert refresher.schedule("b", lambda: None)
+    refresher.wait()
+
+
+def test_refreshes_do_not_hold_up_exit() -> None:
+    refresher = BackgroundRefresher()
+    release = threading.Event()
+    refresher.schedule("a", release.wait)
+    refresher.schedule("b", release.wait)
+
+    start = time.monotonic()
+    refresher.wait(0.2)  # What the default refresher gets at exit.
+    assert time.monotonic() - start < 1
+    assert all(t.daemon for t in refresher._threads)
+
+    release.set()
+    refresher.wait()
+
+
+def test_expired_entries_are_pruned_on_write(
+    cache: StaffCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache.record_name_miss("antonia abbey")
+    cache.put_profile("ab1234", {"department": "Psychology"})
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.NEGATIVE_TTL + 1)
+    cache.put_name("steven winter", "winter steven", "sw1111")
+    with open(cache.path) as f:
+        data = json.load(f)
+    assert list(data["names"]) == ["steven winter"]
+    assert list(data["profiles"]) == ["ab1234"]
+
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.STALE_LIMIT + 1)
+    cache.record_empty_profile("sw1111")
+    with open(cache.path) as f:
+        data = json.load(f)
+    assert list(data["profiles"]) == ["sw1111"]
+
+
+def test_writes_from_other_processes_survive(cache: StaffCache) -> None:
+    other = StaffCache(cache.path)
+    cache.put_name("antonia abbey", "abbey antonia", "ab1234")
+    other.put_name("steven winter", "winter steven", "sw1111")
+    cache.record_empty_profile("ab1234")
+
+    assert set(StaffCache(cache.path).keys("names")) == {
+        "antonia abbey",
+        "steven winter",
+    }
+
+
+def test_concurrent_instances_keep_every_write(cache: StaffCache) -> None:
+    others = [StaffCache(cache.path) for _ in range(2)]
+    barrier = threading.Barrier(len(others))
+
+    def write(n: int) -> None:
+        barrier.wait()
+        for i in range(50):
+            others[n].put_profile(f"id{n}-{i}", {"department": "Psychology"})
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(StaffCache(cache.path).keys("profiles")) == 100
+
+
+def test_reads_see_other_writers(cache: StaffCache) -> None:
+    assert cache.get_profile("ab1234") is None
+
+    StaffCache(cache.path).put_profile("ab1234", {"department": "Psychology"})
+    entry = cache.get_profile("ab1234")
+    assert entry is not None and entry.value == {"department": "Psychology"}
+
+
+class PagedDirectoryHandler(BaseHTTPRequestHandler):
+    """Directory search with a /people/ link on every one of its pages."""
+
+    pages: list[str] = []
+
+    def do_GET(self) -> None:
+        self.pages.append(self.path.rsplit("=", 1)[-1])
+        data = b'<a href="/people/ab1234">Abbey, Antonia</a>'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def test_stale_name_refresh_stops_at_first_link(
+    http_server: Callable[[type[BaseHTTPRequestHandler]], str],
+    cache: StaffCache,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    PagedDirectoryHandler.pages = []
+    base_url = http_server(PagedDirectoryHandler)
+
+    class LocalLookup(StaffLookup):
+        DIR_URL = f"{base_url}/people?type=people&q="
+
+    lookup = LocalLookup(cache)
+    lookup.refresher = BackgroundRefresher()
+    cache.put_name("antonia abbey", "abbey antonia", "old1234")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + staff_cache.POSITIVE_TTL + 1)
+
+    stale = lookup.resolve_query_to_name_and_id("antonia abbey")
+    assert stale == [("abbey antonia", "old1234")]
+    lookup.refresher.wait()
+
+    assert PagedDirectoryHandler.pages == ["1"]
+    assert lookup.resolve_query_to_name_and_id("antonia abbey") == [
+        ("abbey antonia", "ab1234")
+    ]
@@ -0,0 +1,267 @@
+import os
+import threading
+from http.client import BadStatusLine
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+from click.testing import CliRunner
+
+from warrior_bot.core.refresh import sync
+from warrior_bot.utils import sync_services
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.http_pool import HTTPPool
+from warrior_bot.utils.query_log import QueryLog
+from warrior_bot.utils.staff_cache import StaffCache
+from warrior_bot.utils.sync_services import (
+    SyncService,
+    register_service,
+    resolve_service_names,
+    run_services,
+)
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = self.path.encode()
+        if self.path.startswith("/people/"):
+            body = b"<p>Unit: Computer Science</p>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server_url(http_server: Callable[[type[BaseHTTPRequestHandler]], str]) -> str:
+    return http_server(KeepAliveHandler)
+
+
+@pytest.fixture
+def registry(monkeypatch: pytest.MonkeyPatch) -> dict[str, SyncService]:
+    services: dict[str, SyncService] = {}
+    monkeypatch.setattr(sync_services, "SERVICES", services)
+    return services
+
+
+def test_pool_reuses_connections(server_url: str) -> None:
+    pool = HTTPPool()
+    assert pool.get(f"{server_url}/a") == b"/a"
+    assert pool.get(f"{server_url}/b?q=1") == b"/b?q=1"
+    assert pool.requests == 2
+    assert pool.connections == 1
+    pool.close()
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Forward proxy stand-in: echoes what it was asked for, refuses tunnels."""
+
+    connects: list[str] = []
+
+    def do_GET(self) -> None:
+        body = f"{self.path} {self.headers.get('Proxy-Authorization')}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_CONNECT(self) -> None:
+        self.connects.append(self.path)
+        self.send_error(403)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def test_pool_honors_proxy_settings(
+    http_server: Callable[[type[BaseHTTPRequestHandler]], str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    ProxyHandler.connects = []
+    proxy = http_server(ProxyHandler)
+    monkeypatch.setenv("http_proxy", proxy.replace("http://", "http://bot:pw@"))
+    monkeypatch.setenv("https_proxy", proxy)
+    monkeypatch.setenv("no_proxy", "skip.example")
+    pool = HTTPPool()
+
+    assert pool.get("http://wayne.example/people?q=a") == (
+        b"http://wayne.example/people?q=a Basic Ym90OnB3"
+    )
+    with pytest.raises(OSError, match="403"):
+        pool.get("https://wayne.example/people/ab1234")
+    assert ProxyHandler.connects == ["wayne.example:443"]
+    with pytest.raises(OSError):  # Bypassed, so resolved directly and fails.
+        pool.get("http://skip.example/", timeout=1)
+    pool.close()
+
+
+def test_resolve_service_names(registry: dict[str, SyncService]) -> None:
+    for name in ("staff", "locations"):
+        register_service(SyncService(name, "", lambda h: None, str, lambda p: 0))
+
+    assert resolve_service_names(["all"]) == (["staff", "locations"], [])
+    assert resolve_service_names(["Locations", "staff", "locations"]) == (
+        ["locations", "staff"],
+        [],
+    )
+    assert resolve_service_names(["staff", "clubs"]) == (["staff"], ["clubs"])
+
+
+def test_services_run_concurrently_over_one_pool(
+    registry: dict[str, SyncService], server_url: str
+) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    stored: dict[str, bytes] = {}
+
+    def make(name: str) -> SyncService:
+        def fetch(http: HTTPPool) -> bytes:
+            barrier.wait()  # Deadlocks unless both services fetch at once.
+            return http.get(f"{server_url}/{name}")
+
+        def store(raw: bytes) -> int:
+            stored[name] = raw
+            return 1
+
+        return register_service(SyncService(name, "", fetch, bytes, store))
+
+    make("one")
+    make("two")
+    pool = HTTPPool()
+    stages: list[tuple[str, str]] = []
+
+    results = run_services(
+        ["one", "two"], http=pool, progress=lambda n, s: stages.append((n, s))
+    )
+
+    assert [r.name for r in results] == ["one", "two"]
+    assert all(r.ok and r.count == 1 for r in results)
+    assert stored == {"one": b"/one", "two": b"/two"}
+    assert pool.requests == 2
+    assert ("one", "storing") in stages and ("two", "storing") in stages
+
+
+def test_failed_parse_never_stores(registry: dict[str, SyncService]) -> None:
+    stored: list[object] = []
+
+    def parse(raw: object) -> object:
+        raise ValueError("bad page")
+
+    def store(parsed: object) -> int:
+        stored.append(parsed)
+        return 1
+
+    register_service(SyncService("broken", "", lambda h: b"", parse, store))
+
+    (result,) = run_services(["broken"])
+    assert not result.ok and result.error == "bad page"
+    assert stored == []
+
+
+def test_syncs_are_followed_by_dependents() -> None:
+    assert resolve_service_names(["staff"]) == (["staff", "warm", "index"], [])
+    assert resolve_service_names(["locations"]) == (["locations", "index"], [])
+
+
+def test_warm_prefetches_hot_profiles(
+    server_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    log = QueryLog(os.path.join(tmp_path, "log.json"))
+    cache_path = os.path.join(tmp_path, "staff_cache.json")
+    cache = StaffCache(cache_path)
+    cache.put_name("Resh Mahabir", "mahabir resh", "ab1111")
+    for _ in range(2):
+        log.record("Resh Mahabir", "mahabir resh", "ab1111")
+
+    monkeypatch.setattr(sync_services, "QueryLog", lambda: log)
+    monkeypatch.setattr(sync_services, "StaffCache", lambda: StaffCache(cache_path))
+    monkeypatch.setattr(StaffLookup, "STAFF_URL", f"{server_url}/people/")
+
+    (result,) = run_services(["warm"])
+
+    assert result.ok and result.count == 1
+    profile = StaffCache(cache_path).get_profile("ab1111")
+    assert profile is not None and profile.value is not None
+    assert profile.value["department"] == "Computer Science"
+
+
+def test_dependents_of_a_failed_service_are_skipped(
+    registry: dict[str, SyncService],
+) -> None:
+    ran: list[str] = []
+
+    def fetch(name: str) -> Any:
+        def run(http: HTTPPool) -> bytes:
+            ran.append(name)
+            if name == "staff":
+                raise OSError("wayne.edu unreachable")
+            return b""
+
+        return run
+
+    register_service(SyncService("staff", "", fetch("staff"), bytes, len))
+    register_service(
+        SyncService("warm", "", fetch("warm"), bytes, len, depends_on=("staff",))
+    )
+    register_service(
+        SyncService("index", "", fetch("index"), bytes, len, depends_on=("warm",))
+    )
+    register_service(SyncService("locations", "", fetch("locations"), bytes, len))
+
+    results = run_services(["index", "warm", "staff", "locations"])
+
+    assert sorted(ran) == ["locations", "staff"]
+    assert [(r.name, r.error) for r in results] == [
+        ("index", "dependency warm failed"),
+        ("warm", "dependency staff failed"),
+        ("staff", "wayne.edu unreachable"),
+        ("locations", None),
+    ]
+
+
+def test_sync_exits_non_zero_on_failure(registry: dict[str, SyncService]) -> None:
+    def unreachable(http: HTTPPool) -> bytes:
+        raise OSError("wayne.edu unreachable")
+
+    register_service(SyncService("ok", "", lambda h: b"", bytes, len))
+    register_service(SyncService("broken", "", unreachable, bytes, len))
+
+    assert CliRunner().invoke(sync, ["ok"]).exit_code == 0
+    result = CliRunner().invoke(sync, ["ok", "broken"])
+    assert result.exit_code == 1
+    assert "[broken] failed" in result.output
+
+
+def test_sync_exits_non_zero_on_unknown_service(
+    registry: dict[str, SyncService],
+) -> None:
+    ran: list[str] = []
+    register_service(SyncService("ok", "", lambda h: ran.append("ok"), str, len))
+
+    result = CliRunner().invoke(sync, ["ok", "bogus"])
+    assert result.exit_code == 1
+    assert "Unknown service: bogus" in result.output
+    assert ran == []
+
+
+def test_malformed_profile_response_does_not_abort_sync(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    StaffCache().put_profiles({"ab1111": None, "ab2222": None})
+
+    class FlakyPool(HTTPPool):
+        def get(self, url: str, timeout: float | None = None) -> bytes:
+            if url.endswith("ab1111"):
+                raise BadStatusLine("garbage")
+            return b"<p>Unit: Computer Science</p>"
+
+    (result,) = run_services(["profiles"], http=FlakyPool())
+
+    assert result.ok and result.count == 1
+    profile = StaffCache().get_profile("ab2222")
+    assert profile is not None and profile.value is not None
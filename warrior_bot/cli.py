@@ -6,6 +6,7 @@ import click
 
 from warrior_bot.core.about import about
 from warrior_bot.core.data_handler import JSONHandler
+from warrior_bot.core.debug import debug
 from warrior_bot.core.refresh import sync
 from warrior_bot.core.where import where
 
@@ -24,6 +25,7 @@ def cli() -> None:
 cli.add_command(about)
 cli.add_command(where)
 cli.add_command(sync)
+cli.add_command(debug)
 
 # alias to allow the naming of our entry point as cli.py
 main = cli
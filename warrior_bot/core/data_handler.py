@@ -1,9 +1,14 @@
 import difflib
+import hashlib
 import json
 import os
 import re
+import threading
+from dataclasses import dataclass, replace
 from typing import Mapping, cast
 
+from warrior_bot.utils.bm25 import BM25Index
+
 
 class JSONHandler:
     """
@@ -71,20 +76,90 @@ class JSONHandler:
             raise Exception from e
 
 
-class DataHandler:
-    flat: dict[str, str]
+POLL_INTERVAL = 2.0  # Seconds between ReloadingDataHandler change checks.
+
+
+@dataclass(frozen=True)
+class LocationSnapshot:
+    """One load of a locations file and the search indexes built from it.
+
+    Attributes:
+        data (Mapping): Parsed JSON.
+        flat (dict): Flattened keys mapped to result strings.
+        normalized (dict): Normalized keys mapped to their flattened keys.
+        bm25 (BM25Index): Multi-word index over the normalized keys.
+        signature (tuple): (mtime_ns, size, sha256) of the file as loaded.
+    """
+
     data: Mapping[str, object]
+    flat: dict[str, str]
+    normalized: dict[str, str]
+    bm25: BM25Index
+    signature: tuple[int, int, str]
+
+
+def _stat_signature(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class DataHandler:
     path: str
+    snapshot: LocationSnapshot
 
     def __init__(self, data_dir: str, filename: str) -> None:
         self.path = os.path.join(data_dir, filename)
         if not os.path.exists(self.path):
             raise FileNotFoundError(f"Missing data file: {self.path}")
-        with open(self.path, "r") as f:
-            self.data = json.load(f)
-        self.flat = self._flatten(self.data)
+        self.snapshot = self._load()
+
+    # The current snapshot's fields. Code that makes several reads should take
+    # self.snapshot once instead, in case a ReloadingDataHandler swaps it.
+    @property
+    def data(self) -> Mapping[str, object]:
+        return self.snapshot.data
+
+    @property
+    def flat(self) -> dict[str, str]:
+        return self.snapshot.flat
 
-    def _flatten(self, d: Mapping[str, object], parent_key: str = "") -> dict[str, str]:
+    @property
+    def normalized(self) -> dict[str, str]:
+        return self.snapshot.normalized
+
+    @property
+    def bm25(self) -> BM25Index:
+        return self.snapshot.bm25
+
+    def _load(self) -> LocationSnapshot:
+        """Read the data file and build a snapshot from its contents."""
+        return self._build(*self._read())
+
+    def _read(self) -> tuple[bytes, tuple[int, int, str]]:
+        mtime_ns, size = _stat_signature(self.path)
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        return raw, (mtime_ns, size, hashlib.sha256(raw).hexdigest())
+
+    def _build(self, raw: bytes, signature: tuple[int, int, str]) -> LocationSnapshot:
+        data = json.loads(raw)
+        flat = self._flatten(data)
+        normalized = normalize_keys(flat)
+        return LocationSnapshot(
+            data=data,
+            flat=flat,
+            normalized=normalized,
+            bm25=build_bm25(normalized, flat),
+            signature=signature,
+        )
+
+    def _flatten(
+        self,
+        d: Mapping[str, object],
+        parent_key: str = "",
+        root: Mapping[str, object] | None = None,
+    ) -> dict[str, str]:
+        root = root if root is not None else d
         items: dict[str, str] = {}
         for k, v in d.items():
             new_key = f"{parent_key} {k}".strip()
@@ -92,7 +167,7 @@ class DataHandler:
                 v_dict = cast(dict[str, object], v)
                 if "__description__" in v_dict:
                     items[new_key] = str(v_dict["__description__"])
-                items.update(self._flatten(v_dict, new_key))
+                items.update(self._flatten(v_dict, new_key, root))
             elif isinstance(v, list):
                 # Handle arrays of objects (e.g., buildings, locations)
                 for i, item in enumerate(v):
@@ -126,11 +201,10 @@ class DataHandler:
                         elif "name" in item_dict:
                             result_value = str(item_dict["name"])
                         else:
+                            contact = root.get("contact")
                             result_value = (
-                                str(self.data["contact"]["campus_map"])
-                                if "contact" in self.data
-                                and isinstance(self.data["contact"], dict)
-                                and "campus_map" in self.data["contact"]
+                                str(contact["campus_map"])
+                                if isinstance(contact, dict) and "campus_map" in contact
                                 else "https://maps.wayne.edu"
                             )
 
@@ -153,48 +227,169 @@ class DataHandler:
         return items
 
     def search(self, query: str) -> str | None:
-        query = query.lower().replace("_", " ").strip()
-        normalized = {k.lower().replace("_", " "): k for k in self.flat.keys()}
-
-        # exact key or value match first
-        if query in normalized:
-            return self.flat[normalized[query]]
-        for nk, orig in normalized.items():
-            if query == nk.split()[-1]:
-                return self.flat[orig]
-
-        # substring match with word-boundary awareness
-        # prioritize keys where query appears with word boundaries
-        pattern = r"\b" + re.escape(query) + r"\b"
-        word_bound_keys = [
-            (nk, orig) for nk, orig in normalized.items() if re.search(pattern, nk)
-        ]
-        if word_bound_keys:
-            # Filter out keys with "/" to avoid "Faculty/Administration" issues
-            no_slash = [x for x in word_bound_keys if "/" not in x[1]]
-            if no_slash:
-                best_match = min(no_slash, key=lambda x: len(x[0]))
-                return self.flat[best_match[1]]
-            # If all have slashes, use shortest
-            best_match = min(word_bound_keys, key=lambda x: len(x[0]))
-            return self.flat[best_match[1]]
-
-        # general substring match with shortest key
-        substring_matches = [
-            (nk, orig) for nk, orig in normalized.items() if query in nk
-        ]
-        if substring_matches:
-            best_match = min(substring_matches, key=lambda x: len(x[0]))
-            return self.flat[best_match[1]]
-
-        # higher cut off for fuzzy match to reduce noise
-        matches = difflib.get_close_matches(query, normalized.keys(), n=1, cutoff=0.7)
-        if matches:
-            return self.flat[normalized[matches[0]]]
-
-        # final fallback substring match
-        for nk, orig in normalized.items():
-            if query in nk:
-                return self.flat[orig]
-
-        return None
+        snapshot = self.snapshot
+        query = normalize_query(query)
+        best = best_key(query, snapshot.normalized, snapshot.bm25)
+        return snapshot.flat[snapshot.normalized[best]] if best is not None else None
+
+
+class ReloadingDataHandler(DataHandler):
+    """DataHandler that picks up edits to its data file while running.
+
+    A daemon thread polls the file every interval seconds. A changed mtime or
+    size is only a hint: the file is re-read and hashed, and the flattened map
+    and search indexes are rebuilt only if its contents really changed. The
+    new snapshot replaces the old one in a single assignment, so a search
+    runs entirely against whichever snapshot it started with and never waits
+    for a rebuild. A file that fails to load (say, half written) leaves the
+    current snapshot in place until the next change.
+
+    Attributes:
+        interval (float): Seconds between checks.
+        reloads (int): Number of snapshots swapped in since construction.
+        last_error (Exception | None): Why the latest reload failed, if it did.
+    """
+
+    def __init__(
+        self, data_dir: str, filename: str, interval: float = POLL_INTERVAL
+    ) -> None:
+        super().__init__(data_dir, filename)
+        self.interval = interval
+        self.reloads = 0
+        self.last_error: Exception | None = None
+        self._reload_lock = threading.Lock()
+        self._rejected: tuple[int, int] | None = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._poll, name=f"wb-reload-{filename}", daemon=True
+        )
+        self._thread.start()
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> bool:
+        """Reload the data file if it changed since the current snapshot.
+
+        Returns:
+            True if a new snapshot was swapped in.
+        """
+        with self._reload_lock:
+            current = self.snapshot
+            try:
+                stat = _stat_signature(self.path)
+            except OSError as e:
+                self.last_error = e
+                return False
+            if stat == current.signature[:2] or stat == self._rejected:
+                return False
+
+            try:
+                raw, signature = self._read()
+                if signature[2] == current.signature[2]:
+                    # Touched but not edited: keep the indexes, note the stat.
+                    self.snapshot = replace(current, signature=signature)
+                    return False
+                loaded = self._build(raw, signature)
+            except Exception as e:
+                self.last_error = e
+                self._rejected = stat
+                return False
+            self.last_error = None
+            self._rejected = None
+            self.snapshot = loaded
+            self.reloads += 1
+            return True
+
+    def close(self) -> None:
+        """Stop polling; the last snapshot stays searchable."""
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self) -> "ReloadingDataHandler":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a location query the way keys are normalized for search."""
+    return query.lower().replace("_", " ").strip()
+
+
+def normalize_keys(flat: Mapping[str, str]) -> dict[str, str]:
+    """Map normalized search keys to the flattened keys they came from.
+
+    When two keys normalize alike, the later original wins but the key keeps
+    the position of its first occurrence, which search order depends on.
+    """
+    return {k.lower().replace("_", " "): k for k in flat.keys()}
+
+
+def build_bm25(normalized: Mapping[str, str], flat: Mapping[str, str]) -> BM25Index:
+    """Index every normalized key together with the text it resolves to."""
+    return BM25Index((nk, f"{nk} {flat[orig]}") for nk, orig in normalized.items())
+
+
+LOCATION_CUTOFF = 0.7  # difflib ratio for the fuzzy stage of best_key.
+
+
+def best_key(
+    query: str, normalized: Mapping[str, str], bm25: BM25Index | None = None
+) -> str | None:
+    """Pick the normalized key that best answers a normalized query.
+
+    This holds the ranking rules behind DataHandler.search so other indexes
+    can rank their keys identically.
+
+    Args:
+        query: Query already passed through normalize_query.
+        normalized: Normalized keys mapped to their original keys, in order.
+        bm25: Index over the same keys, enabling the multi-word stage.
+
+    Returns:
+        The winning normalized key, or None if nothing matches.
+    """
+    # exact key or value match first
+    if query in normalized:
+        return query
+    for nk in normalized:
+        if query == nk.split()[-1]:
+            return nk
+
+    # substring match with word-boundary awareness
+    # prioritize keys where query appears with word boundaries
+    pattern = r"\b" + re.escape(query) + r"\b"
+    word_bound_keys = [
+        (nk, orig) for nk, orig in normalized.items() if re.search(pattern, nk)
+    ]
+    if word_bound_keys:
+        # Filter out keys with "/" to avoid "Faculty/Administration" issues
+        no_slash = [x for x in word_bound_keys if "/" not in x[1]]
+        if no_slash:
+            return min(no_slash, key=lambda x: len(x[0]))[0]
+        # If all have slashes, use shortest
+        return min(word_bound_keys, key=lambda x: len(x[0]))[0]
+
+    # general substring match with shortest key
+    substring_matches = [nk for nk in normalized if query in nk]
+    if substring_matches:
+        return min(substring_matches, key=len)
+
+    # multi-word match against keys and the text they resolve to
+    if bm25 is not None:
+        best = bm25.best(query)
+        if best is not None:
+            return best
+
+    # higher cut off for fuzzy match to reduce noise
+    matches = difflib.get_close_matches(
+        query, normalized.keys(), n=1, cutoff=LOCATION_CUTOFF
+    )
+    if matches:
+        return matches[0]
+
+    return None
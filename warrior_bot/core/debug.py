@@ -0,0 +1,64 @@
+"""
+warrior-bot's 'debug' command group.
+
+Commands:
+- debug memory: Report memory retained by loaded datasets and caches.
+
+"""
+
+import json
+
+import click
+
+from warrior_bot.utils.memory import collect_memory_report
+
+
+def _human(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@click.group()
+def debug() -> None:
+    """Diagnostics for warrior-bot developers."""
+
+
+@debug.command()
+@click.option("--top", default=10, show_default=True, help="Allocation sites shown.")
+@click.option(
+    "--json",
+    "json_path",
+    default=None,
+    help="Write the full report as JSON to this path ('-' for stdout).",
+)
+def memory(top: int, json_path: str | None) -> None:
+    """Report memory retained by loaded datasets and caches."""
+    report = collect_memory_report(top=top)
+
+    if json_path == "-":
+        click.echo(json.dumps(report.to_dict(), indent=2))
+        return
+
+    click.echo(click.style("Retained size per structure", fg="green", bold=True))
+    for s in report.structures:
+        click.echo(
+            f"  {s.name:<18} {_human(s.bytes):>12}  {s.entries:>7} entries"
+            f"  {_human(s.bytes_per_entry):>10}/entry"
+        )
+
+    click.echo()
+    click.echo(
+        click.style("Traced while loading ", fg="green", bold=True)
+        + f"{_human(report.traced_current)} (peak {_human(report.traced_peak)}) "
+        + f"in {report.load_seconds:.2f}s"
+    )
+    for site in report.top_allocations:
+        click.echo(f"  {_human(site.bytes):>12}  {site.count:>7} blocks  {site.site}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+        click.echo(click.style(f"Report written to {json_path}", fg="green"))
@@ -3,11 +3,13 @@ Command to refresh/sync data parsing for any given service
 """
 
 import importlib.metadata
+import sys
+import threading
 from typing import Any, Callable
 
 import click
 
-from warrior_bot.utils.faculty_parser import build_faculty_cache
+from warrior_bot.utils.sync_services import resolve_service_names, run_services
 
 warrior_bot_version = importlib.metadata.version("warrior-bot")
 
@@ -28,12 +30,22 @@ def _get_version(*sub: str) -> Callable[[Callable[..., Any]], Callable[..., Any]
 @click.command()
 @click.argument("service", nargs=-1)
 @_get_version(warrior_bot_version)
-def sync(service: str) -> None:
+def sync(service: tuple[str, ...]) -> None:
     """
     Manually refresh data parsing services\n
     warrior-bot version: {0} currently handles the following services:\n
         staff:\n
-          - Parses https://bulletins.wayne.edu/faculty/
+          - Parses https://bulletins.wayne.edu/faculty/ (then runs warm, index)\n
+        warm:\n
+          - Prefetches the most looked up staff into the local cache\n
+        profiles:\n
+          - Refreshes cached https://wayne.edu/people/ profiles\n
+        locations:\n
+          - Downloads the latest campus locations.json (then runs index)\n
+        index:\n
+          - Builds the SQLite search index used by where --backend sqlite\n
+        all:\n
+          - Runs every service above concurrently
     """
     text = " ".join(service).strip()
     if not text:
@@ -46,16 +58,39 @@ def sync(service: str) -> None:
         )
         return
 
-    target = service[0].strip().lower()
+    targets, unknown = resolve_service_names(service)
+    if unknown:
+        click.echo(
+            click.style(
+                f"Unknown service: {', '.join(unknown)}",
+                fg="red",
+            )
+        )
+        sys.exit(1)
 
-    if target == "staff":
-        build_faculty_cache()
-        click.echo(click.style("Staff cache has been successfully built!", fg="green"))
-        return
+    echo_lock = threading.Lock()
 
-    click.echo(
-        click.style(
-            f"Unknown service: {target}",
-            fg="red",
-        )
-    )
+    def progress(name: str, stage: str) -> None:
+        with echo_lock:
+            click.echo(click.style(f"[{name}] {stage}...", fg="cyan"))
+
+    results = run_services(targets, progress=progress)
+    for result in results:
+        if result.ok:
+            click.echo(
+                click.style(
+                    f"[{result.name}] synced {result.count} records "
+                    f"in {result.elapsed:.2f}s",
+                    fg="green",
+                )
+            )
+        else:
+            click.echo(
+                click.style(
+                    f"[{result.name}] failed after {result.elapsed:.2f}s: "
+                    f"{result.error}",
+                    fg="red",
+                )
+            )
+    if not all(result.ok for result in results):
+        sys.exit(1)
@@ -3,108 +3,277 @@ warrior-bot's 'where' command module.
 
 Commands:
 - where [query]: Find POI's around campus or staff member details.
+- where --near [place] --type [type]: List the closest places of a type.
+- where --offline / --budget [ms]: Bound or skip the wayne.edu lookups.
 
 """
 
-import os
+import sqlite3
 
 import click
 
-from warrior_bot.core.data_handler import DataHandler
-from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.budget import Budget
+from warrior_bot.utils.faculty_lookup import Staff, StaffLookup
+from warrior_bot.utils.knowledge import KnowledgeIndex, normalize_tag, plan
+from warrior_bot.utils.query_log import QueryLog
+from warrior_bot.utils.sqlite_store import SQLiteStore
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+def _open_store() -> SQLiteStore | None:
+    """Open the SQLite index, or explain why the JSON backend is used instead."""
+    try:
+        return SQLiteStore()
+    except (FileNotFoundError, ValueError, sqlite3.Error) as e:
+        click.echo(
+            click.style(
+                f"[NOTE] {e}. Run `wb sync index` to build it; using JSON data.",
+                fg="yellow",
+            )
+        )
+        return None
 
 
 @click.command()
 @click.argument("query", nargs=-1)
-def where(query: str) -> None:
+@click.option(
+    "--backend",
+    type=click.Choice(["json", "sqlite"]),
+    default="json",
+    show_default=True,
+    help="Search the knowledge index of the JSON data files or the SQLite index.",
+)
+@click.option(
+    "--near",
+    metavar="PLACE",
+    help="List the places closest to PLACE instead of searching.",
+)
+@click.option(
+    "--type",
+    "place_type",
+    metavar="TYPE",
+    help="With --near, only list places of this type (e.g. food, library).",
+)
+@click.option(
+    "-k",
+    "--limit",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="With --near, how many places to list.",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Answer only from local caches and locations.json.",
+)
+@click.option(
+    "--budget",
+    "budget_ms",
+    type=click.IntRange(min=0),
+    metavar="MS",
+    help="Give up on network lookups after MS milliseconds and answer locally.",
+)
+def where(
+    query: str,
+    backend: str,
+    near: str | None,
+    place_type: str | None,
+    limit: int,
+    offline: bool,
+    budget_ms: int | None,
+) -> None:
     """Find POI's around campus."""
     text = " ".join(query).strip()
+    if near is not None:
+        # `where food --near "old main"` reads the query as the type.
+        _where_near(near, place_type or text or None, limit)
+        return
+
     if not text:
         click.echo("Please provide a valid person or place to search for.")
         return
 
-    extractor = StaffLookup()
-    staff_lst = extractor.resolve_user_input_to_name_and_id(text)
+    budget = Budget(
+        seconds=budget_ms / 1000 if budget_ms is not None else None, offline=offline
+    )
+
+    index: KnowledgeIndex | SQLiteStore | None = None
+    if backend == "sqlite":
+        index = _open_store()
+    if index is None:
+        index = KnowledgeIndex.load()
+
+    extractor = StaffLookup(store=index, query_log=QueryLog(), budget=budget)
+    _where_search(text, index, extractor)
+
+    for note in budget.notes():
+        click.echo(click.style(f"[NOTE] {note}", fg="yellow"))
 
-    if staff_lst:
-        staff_name, staff_id = staff_lst[0]
 
+def _where_search(
+    text: str, index: KnowledgeIndex | SQLiteStore, extractor: StaffLookup
+) -> None:
+    """Answer a `where` query with the first planned record kind that matches."""
+    empty_profile = False
+    unfetched: str | None = None
+
+    for kind in plan("where"):
+        if kind == "place":
+            result = index.search(text)
+            if result:
+                click.echo(result)
+                return
+            continue
+
+        staff_lst = extractor.resolve_user_input_to_name_and_id(text)
+        if not staff_lst:
+            continue
+
+        staff_name, staff_id = staff_lst[0]
         proper = extractor.normalize_name(staff_name)
-        dep: str | None = extractor.resolve_id_to_department(staff_id)
-        office: str | None = extractor.resolve_id_to_office(staff_id)
-        email: str | None = extractor.resolve_id_to_email(staff_id)
-        phone: str | None = extractor.resolve_id_to_phone(staff_id)
-
-        if not any([dep, office, email, phone]):
-            click.echo(
-                click.style(
-                    "[ERROR] No documented information found for this staff member.\n"
-                    "This is probably a student or an incomplete profile.",
-                    fg="red",
-                )
-            )
-            return
-
-        if dep:
-            click.echo(
-                click.style("", fg="green")
-                + click.style(proper, fg="blue")
-                + click.style(" works in the ", fg="green")
-                + click.style(dep, fg="blue")
-                + click.style(" department", fg="green")
+        profile = extractor.resolve_id_to_profile(staff_id)
+        if profile is None:
+            budget = extractor.budget
+            if budget is not None and budget.was_skipped(extractor.PROFILE_STAGE):
+                unfetched = proper
+            else:
+                # Empty profiles are often accidental fuzzy matches for places.
+                empty_profile = True
+            continue
+
+        _echo_profile(proper, profile)
+        return
+
+    if unfetched is not None:
+        click.echo(
+            click.style(unfetched, fg="blue")
+            + click.style(
+                " is in the staff directory, but their profile is not cached.",
+                fg="green",
             )
-        else:
-            click.echo(
-                click.style(
-                    "[ERROR] Department could not be found for this staff member.",
-                    fg="red",
-                )
+        )
+    elif empty_profile:
+        click.echo(
+            click.style(
+                "[ERROR] No documented information found for this staff member.\n"
+                "This is probably a student or an incomplete profile.",
+                fg="red",
             )
+        )
+    else:
+        click.echo("No documented match found.")
 
-        if office:
-            click.echo(
-                click.style("You can find them at ", fg="green")
-                + click.style(office, fg="blue")
-            )
-        else:
-            click.echo(
-                click.style(
-                    "[ERROR] This staff member does not have a registered office.",
-                    fg="red",
-                )
+
+def _where_near(near: str, place_type: str | None, limit: int) -> None:
+    """Print the places closest to near, optionally of one type."""
+    index = KnowledgeIndex.load()
+    anchor = index.locate(near)
+    if anchor is None:
+        click.echo(
+            click.style(
+                f"[ERROR] No place with known coordinates matches '{near}'.",
+                fg="red",
             )
+        )
+        return
 
-        if email:
-            click.echo(
-                click.style("Their email is ", fg="green")
-                + click.style(email, fg="blue")
+    if place_type and normalize_tag(place_type) not in index.place_types():
+        click.echo(
+            click.style(
+                f"[ERROR] Unknown place type '{place_type}'. Known types: "
+                + ", ".join(index.place_types()),
+                fg="red",
             )
-        else:
-            click.echo(
-                click.style(
-                    "[ERROR] This staff member does not have a registered email.",
-                    fg="red",
-                )
+        )
+        return
+
+    results = index.nearest(anchor, limit, place_type)
+    if not results:
+        click.echo("No documented match found.")
+        return
+
+    click.echo(
+        click.style("Closest to ", fg="green")
+        + click.style(anchor.label, fg="blue")
+        + click.style(":", fg="green")
+    )
+    for distance, record in results:
+        name = record.label if record.label.lower() in record.value.lower() else None
+        click.echo(
+            "  "
+            + (click.style(record.label, fg="blue") + " - " if name is None else "")
+            + record.value
+            + click.style(f" (~{round(distance, -1):.0f} m)", fg="green")
+        )
+
+
+def _echo_profile(proper: str, profile: Staff) -> None:
+    """Print a staff member's profile the way `where` reports people."""
+    dep = profile.department
+    office = profile.office
+    email = profile.email
+    phone = profile.phone
+
+    if dep:
+        click.echo(
+            click.style("", fg="green")
+            + click.style(proper, fg="blue")
+            + click.style(" works in the ", fg="green")
+            + click.style(dep, fg="blue")
+            + click.style(" department", fg="green")
+        )
+    else:
+        click.echo(
+            click.style(
+                "[ERROR] Department could not be found for this staff member.",
+                fg="red",
             )
+        )
 
-        if phone:
-            click.echo(
-                click.style("and their office phone number is ", fg="green")
-                + click.style(phone, fg="blue")
+    if office:
+        click.echo(
+            click.style("You can find them at ", fg="green")
+            + click.style(office, fg="blue")
+        )
+    else:
+        click.echo(
+            click.style(
+                "[ERROR] This staff member does not have a registered office.",
+                fg="red",
             )
-        else:
-            click.echo(
-                click.style(
-                    "[ERROR] This staff member does not have\n"
-                    "a registered phone number.",
-                    fg="red",
-                )
+        )
+
+    if email:
+        click.echo(
+            click.style("Their email is ", fg="green") + click.style(email, fg="blue")
+        )
+    else:
+        click.echo(
+            click.style(
+                "[ERROR] This staff member does not have a registered email.",
+                fg="red",
             )
+        )
 
-        return
+    if phone:
+        click.echo(
+            click.style("and their office phone number is ", fg="green")
+            + click.style(phone, fg="blue")
+        )
+    else:
+        click.echo(
+            click.style(
+                "[ERROR] This staff member does not have\n"
+                "a registered phone number.",
+                fg="red",
+            )
+        )
 
-    handler = DataHandler(DATA_DIR, "locations.json")
-    result = handler.search(text)
-    click.echo(result if result else "No documented match found.")
+    if profile.stale:
+        click.echo(
+            click.style(
+                "[NOTE] These details are from a stale local cache and are "
+                "being refreshed.",
+                fg="yellow",
+            )
+        )
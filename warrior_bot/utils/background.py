@@ -0,0 +1,108 @@
+"""
+Bounded background refreshes for stale cached data.
+
+A refresh runs on a plain thread when called from the synchronous CLI, or as
+an asyncio task (wrapping a worker thread) when an event loop is running, as
+in a long-running bot. At most max_concurrent refreshes run at once and the
+same key is never refreshed twice concurrently; refreshes that do not fit are
+dropped, since the stale entry will schedule another one on its next read.
+
+Refresh threads are daemons, so a one-shot CLI command prints its (stale)
+answer and exits without waiting on a slow wayne.edu. At exit the default
+refresher gives running refreshes EXIT_GRACE seconds to land; one that is cut
+off loses nothing, since caches are only ever written atomically and the
+stale entry will schedule a new refresh next time.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+from typing import Any, Callable
+
+MAX_REFRESHES = 4  # Default number of refreshes allowed to run at once.
+EXIT_GRACE = 0.5  # Seconds the process waits at exit for running refreshes.
+
+
+class BackgroundRefresher:
+    """Schedule keyed refresh callables off the caller's critical path."""
+
+    def __init__(self, max_concurrent: int = MAX_REFRESHES) -> None:
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._threads: list[threading.Thread] = []
+        self._tasks: set["asyncio.Task[Any]"] = set()
+
+    def schedule(self, key: str, refresh: Callable[[], object]) -> bool:
+        """Run refresh in the background unless key is already refreshing.
+
+        Args:
+            key: Identifier of the record being refreshed.
+            refresh: Callable that fetches and stores the fresh record.
+
+        Returns:
+            True if the refresh was scheduled, False if it was dropped.
+        """
+        with self._lock:
+            if key in self._pending or not self._slots.acquire(blocking=False):
+                return False
+            self._pending.add(key)
+
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            task = loop.create_task(asyncio.to_thread(self._run, key, refresh))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            thread = threading.Thread(
+                target=self._run,
+                args=(key, refresh),
+                name=f"wb-refresh-{key}",
+                daemon=True,
+            )
+            with self._lock:
+                self._threads = [t for t in self._threads if t.is_alive()]
+                self._threads.append(thread)
+            thread.start()
+        return True
+
+    def _run(self, key: str, refresh: Callable[[], object]) -> None:
+        try:
+            refresh()
+        except Exception:
+            # The stale record stays served; the next read will retry.
+            pass
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+            self._slots.release()
+
+    def pending(self) -> int:
+        """Number of refreshes currently scheduled or running."""
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until every thread-based refresh has finished.
+
+        Args:
+            timeout: Overall limit in seconds for all refreshes, None to wait
+                for as long as they take.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            thread.join(remaining)
+
+
+default_refresher = BackgroundRefresher()
+atexit.register(default_refresher.wait, EXIT_GRACE)
@@ -0,0 +1,180 @@
+"""
+BM25 inverted index used as the multi-word stage of location search.
+
+Each document is a searchable key plus the text it resolves to, so a query can
+match descriptive values ("reservable rooms", "pool and gym") and not only
+keys. Term weights are computed once when the index is built:
+
+    w(t, d) = idf(t) * tf * (K1 + 1) / (tf + K1 * (1 - B + B * len(d) / avglen))
+
+so scoring a query only sums the precomputed weights along the posting lists
+of its terms. Query terms missing from the vocabulary are spell-corrected
+against it first, then completed when they are the prefix of an indexed term
+("rec" -> "recreation"); terms that still are not indexed are dropped.
+
+The stage is deliberately conservative: it only answers queries of two or
+more terms, and the winning document has to contain every indexed term. What
+is left after dropping unknown terms must be either two or more terms, or one
+rare term (in at most RARE_SHARE of the documents) typed exactly as indexed.
+A single generic or guessed word ("hall", "center", "room" -> "rooms") is not
+evidence of a match, so anything else falls through to the fuzzy stage.
+"""
+
+import math
+import re
+import sys
+from collections import defaultdict
+from difflib import get_close_matches
+from typing import Callable, Iterable, Sequence
+
+K1 = 1.2
+B = 0.75
+CORRECTION_CUTOFF = 0.8  # difflib ratio for correcting a misspelled term
+MIN_PREFIX = 3  # shortest unknown term completed as a prefix
+RARE_SHARE = 0.01  # a lone known term must be in at most this share of documents
+
+STOPWORDS = frozenset(
+    "a an and are at by for from how i in is it near of on or the to what where "
+    "with".split()
+)
+
+TOKEN = re.compile(r"[a-z0-9]+")
+
+Postings = Sequence[tuple[int, float]]
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase text and split it into terms, dropping stopwords."""
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def length_window(length: int, cutoff: float) -> tuple[int, int]:
+    """Candidate lengths that can reach a difflib ratio of cutoff."""
+    low = int(length * cutoff / (2 - cutoff))
+    high = int(length * (2 - cutoff) / cutoff) + 1
+    return low, high
+
+
+def _known_term(
+    term: str,
+    postings: Callable[[str], Postings | None],
+    vocabulary: Callable[[int, int], Iterable[str]],
+) -> str | None:
+    """Map a query term to an indexed term: as is, corrected, or completed."""
+    if postings(term) is not None:
+        return term
+    low, high = length_window(len(term), CORRECTION_CUTOFF)
+    matches = get_close_matches(
+        term, vocabulary(low, high), n=1, cutoff=CORRECTION_CUTOFF
+    )
+    if matches:
+        return matches[0]
+    if len(term) >= MIN_PREFIX:
+        completions = [
+            t for t in vocabulary(len(term) + 1, sys.maxsize) if t.startswith(term)
+        ]
+        if completions:
+            return min(completions, key=lambda t: (len(t), t))
+    return None
+
+
+def best_document(
+    query: str,
+    postings: Callable[[str], Postings | None],
+    vocabulary: Callable[[int, int], Iterable[str]],
+    documents: int,
+) -> int | None:
+    """Rank documents for a query and return the winner's number.
+
+    Args:
+        query: Normalized search text.
+        postings: Returns (document, weight) pairs for a term, or None if the
+            term is not in the index.
+        vocabulary: Returns the indexed terms with a length in [low, high].
+        documents: Number of documents in the index.
+
+    Returns:
+        The highest scoring document containing every indexed query term (the
+        lowest document number on ties), or None if too little of the query is
+        indexed to trust a match.
+    """
+    terms = tokenize(query)
+    if len(terms) < 2:
+        return None
+
+    known: dict[str, Postings] = {}
+    verbatim = set()
+    for term in terms:
+        indexed = _known_term(term, postings, vocabulary)
+        found = postings(indexed) if indexed is not None else None
+        if indexed is not None and found is not None:
+            known[indexed] = found
+            if indexed == term:
+                verbatim.add(term)
+
+    if not known:
+        return None
+    if len(known) == 1:
+        # A lone term only counts when typed as is and rare enough to be specific.
+        ((term, found),) = known.items()
+        if term not in verbatim or len(found) > documents * RARE_SHARE:
+            return None
+
+    scores: dict[int, float] = defaultdict(float)
+    hits: dict[int, int] = defaultdict(int)
+    for found in known.values():
+        for doc, weight in found:
+            scores[doc] += weight
+            hits[doc] += 1
+
+    complete = [doc for doc in scores if hits[doc] == len(known)]
+    if not complete:
+        return None
+    return max(complete, key=lambda doc: (scores[doc], -doc))
+
+
+class BM25Index:
+    """In-memory inverted index over (key, text) documents.
+
+    Attributes:
+        keys (list): Document keys, numbered in the order given.
+        postings (dict): Term -> (document number, BM25 weight) pairs.
+    """
+
+    def __init__(self, documents: Iterable[tuple[str, str]]) -> None:
+        self.keys: list[str] = []
+        counts: list[dict[str, int]] = []
+        for key, text in documents:
+            tf: dict[str, int] = defaultdict(int)
+            for term in tokenize(text):
+                tf[term] += 1
+            self.keys.append(key)
+            counts.append(tf)
+        self.postings = self._weigh(counts)
+
+    @staticmethod
+    def _weigh(counts: list[dict[str, int]]) -> dict[str, list[tuple[int, float]]]:
+        n = len(counts)
+        lengths = [sum(tf.values()) for tf in counts]
+        avglen = (sum(lengths) / n) if n else 0.0
+
+        df: dict[str, int] = defaultdict(int)
+        for tf in counts:
+            for term in tf:
+                df[term] += 1
+
+        postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for doc, tf in enumerate(counts):
+            norm = K1 * (1 - B + B * lengths[doc] / avglen) if avglen else K1
+            for term, f in tf.items():
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                postings[term].append((doc, idf * f * (K1 + 1) / (f + norm)))
+        return dict(postings)
+
+    def vocabulary(self, low: int, high: int) -> list[str]:
+        return [t for t in self.postings if low <= len(t) <= high]
+
+    def best(self, query: str) -> str | None:
+        """Return the key of the best document for a multi-word query."""
+        doc = best_document(query, self.postings.get, self.vocabulary, len(self.keys))
+        return self.keys[doc] if doc is not None else None
@@ -0,0 +1,122 @@
+"""
+Wall-clock budget for the network stages of a single command.
+
+`where --offline` and `where --budget MS` hand a Budget to StaffLookup. Local
+work (fuzzy matching, cache and locations lookups) always runs; every network
+stage goes through Budget.run, which
+
+    - skips the stage outright in offline mode or once the budget is spent
+    - otherwise runs it on a daemon thread and stops waiting for it when the
+      budget runs out, so a slow or unreachable wayne.edu can never hold the
+      command past its deadline (the abandoned request is still bounded by the
+      HTTP pool's socket timeout and dies with the process)
+
+Skipped stages are recorded with the reason, so the command can say what its
+answer is missing.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class BudgetExceeded(OSError):
+    """A network stage was skipped, cancelled or failed under a Budget."""
+
+
+@dataclass
+class Budget:
+    """Network allowance for one command.
+
+    Attributes:
+        seconds (float | None): Total time allowed, None for no limit.
+        offline (bool): Skip every network stage.
+        started (float): time.monotonic() when the budget started.
+        skipped (list): (stage, reason) for every stage that did not complete.
+    """
+
+    seconds: float | None = None
+    offline: bool = False
+    started: float = field(default_factory=time.monotonic)
+    skipped: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def limited(self) -> bool:
+        """Whether network stages may be skipped or cut short."""
+        return self.offline or self.seconds is not None
+
+    def remaining(self) -> float | None:
+        """Seconds left, or None when there is no limit."""
+        if self.seconds is None:
+            return None
+        return self.seconds - (time.monotonic() - self.started)
+
+    def skip(self, stage: str, reason: str) -> None:
+        self.skipped.append((stage, reason))
+
+    def was_skipped(self, stage: str) -> bool:
+        return any(s == stage for s, _ in self.skipped)
+
+    def notes(self) -> list[str]:
+        """One human readable line per skipped stage."""
+        return [f"Skipped {stage} ({reason})." for stage, reason in self.skipped]
+
+    def run(self, stage: str, fn: Callable[[], T]) -> T:
+        """Run a network stage within the budget.
+
+        Args:
+            stage: Name used in notes, e.g. "staff profile lookup".
+            fn: The network work to do.
+
+        Returns:
+            Whatever fn returns.
+
+        Raises:
+            BudgetExceeded: If the stage was skipped, ran out of time or failed
+                with an OSError. The stage is recorded in skipped.
+        """
+        if self.offline:
+            self.skip(stage, "offline")
+            raise BudgetExceeded(stage)
+
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            self.skip(stage, "time budget spent")
+            raise BudgetExceeded(stage)
+
+        if remaining is None:
+            try:
+                return fn()
+            except OSError as e:
+                self.skip(stage, f"failed: {e}")
+                raise BudgetExceeded(stage) from e
+
+        outcome: dict[str, Any] = {}
+        done = threading.Event()
+
+        def target() -> None:
+            try:
+                outcome["value"] = fn()
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=target, name=f"budget: {stage}", daemon=True).start()
+        if not done.wait(remaining):
+            self.skip(
+                stage, f"cancelled at the {(self.seconds or 0) * 1000:.0f} ms budget"
+            )
+            raise BudgetExceeded(stage)
+
+        error = outcome.get("error")
+        if isinstance(error, OSError):
+            self.skip(stage, f"failed: {error}")
+            raise BudgetExceeded(stage) from error
+        if error is not None:
+            raise error
+        value: T = outcome["value"]
+        return value
@@ -17,27 +17,103 @@ Private Methods:
         Fetch and parse the HTML content from the staff profile page.
     _get_raw_html(soup: BeautifulSoup) -> str:
         Extract and clean the raw text from a BeautifulSoup object.
+
+Directory and profile lookups are remembered in a StaffCache. Misses skip the
+network until they expire; expired records are still served immediately, marked
+as stale, while a BackgroundRefresher fetches a fresh copy for next time.
 """
 
-from dataclasses import dataclass
-from difflib import get_close_matches
-from typing import Generator
-from urllib.request import urlopen
+from dataclasses import dataclass, replace
+from typing import Callable, Generator, Protocol, TypeVar
 
 from bs4 import BeautifulSoup
 
+from warrior_bot.utils.background import BackgroundRefresher, default_refresher
+from warrior_bot.utils.budget import Budget, BudgetExceeded
+from warrior_bot.utils.fuzzy import shared_matcher
+from warrior_bot.utils.http_pool import HTTPPool, default_pool
+from warrior_bot.utils.query_log import QueryLog
+from warrior_bot.utils.single_flight import SingleFlight, default_flights
+from warrior_bot.utils.staff_cache import StaffCache
+
+
+class FacultyMatcher(Protocol):
+    """Index that can stand in for the JSON faculty cache in match_faculty."""
+
+    def match_faculty(self, user_input: str) -> str | None: ...
+
+
+PROFILE_FIELDS = ("department", "office", "email", "phone")
+FACULTY_CUTOFF = 0.6  # difflib ratio a name needs to match in match_faculty.
+
+T = TypeVar("T")
+
+
+@dataclass
+class Staff:
+    name: str | None
+    department: str | None
+    office: str | None
+    email: str | None
+    phone: str | None
+    stale: bool = False  # Served from an expired cache entry.
+
 
 class StaffLookup:
     DIR_URL = "https://wayne.edu/people?type=people&q="  # Directory search URL
     STAFF_URL = "https://wayne.edu/people/"  # Base URL for staff profiles
     MAX_PAGES = 5  # Amount of pages _fetch_soup_dir will look through.
-
-    def __init__(self) -> None:
-        pass
+    DIRECTORY_STAGE = "staff directory lookup"  # Stage names used in Budget notes.
+    PROFILE_STAGE = "staff profile lookup"
+    REFRESH_STAGE = "refresh of stale cached details"
+
+    def __init__(
+        self,
+        cache: StaffCache | None = None,
+        refresher: BackgroundRefresher | None = None,
+        http: HTTPPool | None = None,
+        store: FacultyMatcher | None = None,
+        query_log: QueryLog | None = None,
+        budget: Budget | None = None,
+        flights: SingleFlight | None = None,
+    ) -> None:
+        self.cache = cache if cache is not None else StaffCache()
+        self.refresher = refresher if refresher is not None else default_refresher
+        self.http = http if http is not None else default_pool
+        self.store = store
+        self.query_log = query_log  # Only `where` opts in to recording queries.
+        self.budget = budget  # Bounds network stages for --offline / --budget.
+        self.flights = flights if flights is not None else default_flights
+
+    def _network(self, stage: str, fetch: Callable[[], T], fallback: T) -> T:
+        """Run a network stage under the budget, returning fallback if skipped."""
+        if self.budget is None:
+            return fetch()
+        try:
+            return self.budget.run(stage, fetch)
+        except BudgetExceeded:
+            return fallback
+
+    def _schedule_refresh(self, key: str, refresh: Callable[[], object]) -> None:
+        """Refresh a stale cache entry in the background, unless budgeted.
+
+        A background refresh would outlive a budgeted command (or need the
+        network offline), so under a limited budget it is only noted.
+        """
+        if self.budget is not None and self.budget.limited:
+            if not self.budget.was_skipped(self.REFRESH_STAGE):
+                reason = "offline" if self.budget.offline else "time budget set"
+                self.budget.skip(self.REFRESH_STAGE, reason)
+            return
+        self.refresher.schedule(key, refresh)
 
     def _fetch_soup_dir(self, query: str) -> BeautifulSoup:
         """Fetch and parse the HTML content from the staff directory search page.
 
+        Paging stops at the first page with a /people/ link, the only one
+        parse_directory uses, so a (background) refresh of a known name usually
+        costs a single request.
+
         Args:
             query (str): The search query for the staff member.
 
@@ -54,13 +130,16 @@ class StaffLookup:
             try:
                 page = f"&page={i}"
                 url: str = f"{self.DIR_URL}{query.replace(' ', '+')}{page}"
-                html: str = urlopen(url).read()
+                html = self.http.get(url)
                 data: BeautifulSoup = BeautifulSoup(html, features="html.parser")
 
                 for tag in soup(["script", "style"]):
                     tag.extract()
 
+                found = self.parse_directory(data) is not None
                 soup.append(data)
+                if found:
+                    break
 
                 i += 1
             except Exception:
@@ -76,7 +155,12 @@ class StaffLookup:
 
         """
         url: str = f"{self.STAFF_URL}{query.replace(' ', '+')}"
-        html: str = urlopen(url).read()
+        html = self.http.get(url)
+        return self.soup_from_html(html)
+
+    @staticmethod
+    def soup_from_html(html: bytes | str) -> BeautifulSoup:
+        """Parse HTML into a BeautifulSoup object without script/style tags."""
         soup: BeautifulSoup = BeautifulSoup(html, features="html.parser")
 
         for tag in soup(["script", "style"]):
@@ -100,7 +184,8 @@ class StaffLookup:
             parts = [parts[1], parts[0]]
         return " ".join(part.capitalize() for part in parts)
 
-    def _build_searchable_names(self, cache: list[dict[str, str | None]]) -> list[str]:
+    @staticmethod
+    def _build_searchable_names(cache: list[dict[str, str | None]]) -> list[str]:
         """Build list of searchable name strings from faculty cache.
 
         Creates multiple variations for each name to improve fuzzy matching:
@@ -121,7 +206,8 @@ class StaffLookup:
                     names.append(f"{first} {middle} {last}")
         return names
 
-    def _cache_entry_to_query(self, entry: dict[str, str | None]) -> str:
+    @staticmethod
+    def _cache_entry_to_query(entry: dict[str, str | None]) -> str:
         """Convert a cache entry to a search query string."""
         first = entry.get("first") or ""
         middle = entry.get("middle") or ""
@@ -131,99 +217,249 @@ class StaffLookup:
             return f"{first} {middle} {last}"
         return f"{first} {last}"
 
-    def resolve_user_input_to_name_and_id(
-        self, user_input: str
-    ) -> list[tuple[str, str]]:
-        """Resolve user input to staff name and ID using cached faculty data.
+    def match_faculty(self, user_input: str) -> str | None:
+        """Fuzzy match user input against the local faculty cache.
 
-        Fuzzy matches user input against the local faculty cache (no HTTP request),
-        then queries the /people endpoint with the best match to get the staff ID.
+        No HTTP request is made. When a store (the SQLite index or the
+        knowledge index) is configured the match runs against it instead of
+        loading the JSON cache.
 
         Args:
             user_input: The input name of the staff member to look up.
 
         Returns:
-            List of (name, staff_id) tuples for the best match.
+            The corrected "First [Middle] Last" query for the best match, or
+            None if nothing in the faculty cache is close enough.
         """
+        if self.store is not None:
+            return self.store.match_faculty(user_input)
+
         from warrior_bot.utils.faculty_parser import load_faculty_cache
 
         cache = load_faculty_cache()
         if not cache:
-            return []
+            return None
 
         query = user_input.lower().replace(",", "").strip()
         tokens = query.split()
         reversed_query = " ".join(reversed(tokens))
 
-        searchable_names = self._build_searchable_names(cache)
-
+        # Large directories are scored on a process pool; see utils.fuzzy.
         best_match: str | None = None
-        for q in [query, reversed_query]:
-            matches = get_close_matches(q, searchable_names, n=1, cutoff=0.6)
-            if matches:
-                best_match = matches[0]
-                break
+        with shared_matcher(self._build_searchable_names(cache)) as matcher:
+            for q in [query, reversed_query]:
+                best_match = matcher.best(q, cutoff=FACULTY_CUTOFF)
+                if best_match:
+                    break
 
         if not best_match:
-            return []
+            return None
 
         match_tokens = set(best_match.split())
-        corrected_query: str | None = None
 
         for entry in cache:
             first = (entry.get("first") or "").lower()
             last = (entry.get("last") or "").lower()
 
             if first in match_tokens and last in match_tokens:
-                corrected_query = self._cache_entry_to_query(entry)
-                break
+                return self._cache_entry_to_query(entry)
+
+        return None
+
+    def resolve_user_input_to_name_and_id(
+        self, user_input: str
+    ) -> list[tuple[str, str]]:
+        """Resolve user input to staff name and ID using cached faculty data.
+
+        Fuzzy matches user input against the local faculty cache (no HTTP request),
+        then queries the /people endpoint with the best match to get the staff ID.
+
+        Args:
+            user_input: The input name of the staff member to look up.
 
+        Returns:
+            List of (name, staff_id) tuples for the best match.
+        """
+        corrected_query = self.match_faculty(user_input)
         if not corrected_query:
             return []
+        return self.resolve_query_to_name_and_id(corrected_query)
 
+    def resolve_query_to_name_and_id(
+        self, corrected_query: str
+    ) -> list[tuple[str, str]]:
+        """Resolve a corrected faculty query to staff name and ID.
+
+        Args:
+            corrected_query: "First [Middle] Last" as returned by match_faculty.
+
+        Returns:
+            List of (name, staff_id) tuples for the directory match.
+        """
+        cached = self.cache.get_name(corrected_query)
+        result: list[tuple[str, str]]
+        if cached is None:
+            result = self._network(
+                self.DIRECTORY_STAGE,
+                lambda: self._lookup_directory(corrected_query),
+                [],
+            )
+        else:
+            if cached.stale:
+                self._schedule_refresh(
+                    f"name:{corrected_query.lower()}",
+                    lambda: self._lookup_directory(corrected_query),
+                )
+            result = (
+                [(str(cached.value["name"]), str(cached.value["id"]))]
+                if cached.value is not None
+                else []
+            )
+
+        if result and self.query_log is not None:
+            self.query_log.record(corrected_query, *result[0])
+        return result
+
+    def _lookup_directory(self, corrected_query: str) -> list[tuple[str, str]]:
+        """Search the directory for a corrected query and cache the outcome.
+
+        Concurrent lookups of the same query (from any StaffLookup sharing
+        self.flights) wait for a single fetch and share its result.
+        """
+        key = f"name:{self.DIR_URL}{' '.join(corrected_query.lower().split())}"
+        return list(
+            self.flights.do(key, lambda: self._search_directory(corrected_query))
+        )
+
+    def _search_directory(self, corrected_query: str) -> list[tuple[str, str]]:
         soup = self._fetch_soup_dir(corrected_query)
+        found = self.parse_directory(soup)
+
+        if found is not None:
+            self.cache.put_name(corrected_query, *found)
+            return [found]
+
+        # Only trust the miss if at least one directory page actually loaded.
+        if soup.contents:
+            self.cache.record_name_miss(corrected_query)
+        elif self.budget is not None:
+            self.budget.skip(self.DIRECTORY_STAGE, "wayne.edu could not be reached")
+
+        return []
 
+    @staticmethod
+    def parse_directory(soup: BeautifulSoup) -> tuple[str, str] | None:
+        """Return the (name, staff_id) of the first /people/ link in soup."""
         for a in soup.find_all("a", href=True):
             href = str(a["href"])
             if href.startswith("/people/"):
                 text = a.get_text(strip=True).lower().replace(",", "")
                 staff_id = href.strip("/").split("/")[-1]
-                return [(text, staff_id)]
+                return text, staff_id
+        return None
 
-        return []
+    def resolve_id_to_profile(self, staff_id: str) -> Staff | None:
+        """Resolve a staff ID to every documented profile field in one fetch.
+
+        A cached profile is returned without touching the network. If it has
+        expired it is still returned, with stale set, and a background refresh
+        is scheduled.
 
-    def resolve_id_to_department(self, staff_id: str) -> str | None:
-        """
         Args:
             staff_id (str): Staff members ID.
+
+        Returns:
+            Staff with the parsed fields, or None when the profile documents
+            none of them (probably a student or an incomplete profile).
+        """
+        cached = self.cache.get_profile(staff_id)
+        if cached is None:
+            return self._network(
+                self.PROFILE_STAGE, lambda: self._lookup_profile(staff_id), None
+            )
+
+        if cached.stale:
+            self._schedule_refresh(
+                f"profile:{staff_id}", lambda: self._lookup_profile(staff_id)
+            )
+        if cached.value is None:
+            return None
+        fields = {f: cached.value.get(f) for f in PROFILE_FIELDS}
+        return Staff(name=None, stale=cached.stale, **fields)
+
+    def _lookup_profile(self, staff_id: str) -> Staff | None:
+        """Fetch and parse a staff profile and cache the outcome.
+
+        Concurrent lookups of the same staff ID share a single fetch.
         """
+        key = f"profile:{self.STAFF_URL}{staff_id}"
+        staff = self.flights.do(key, lambda: self._fetch_profile(staff_id))
+        return replace(staff) if staff is not None else None
 
-        soup: BeautifulSoup = self._fetch_soup_staff(staff_id)
-        content = self._get_raw_html(soup)
+    def _fetch_profile(self, staff_id: str) -> Staff | None:
+        staff = self.parse_profile(self._fetch_soup_staff(staff_id))
 
-        content_lines = content.splitlines()
+        if staff is None:
+            self.cache.record_empty_profile(staff_id)
+            return None
 
+        self.cache.put_profile(staff_id, {f: getattr(staff, f) for f in PROFILE_FIELDS})
+        return staff
+
+    def parse_profile(self, soup: BeautifulSoup) -> Staff | None:
+        """Parse the documented fields out of a staff profile page.
+
+        Returns:
+            Staff with the parsed fields, or None if none are documented.
+        """
+        content_lines = self._get_raw_html(soup).splitlines()
+
+        staff = Staff(
+            name=None,
+            department=self._parse_department(content_lines),
+            office=self._parse_labeled(content_lines, "Office:"),
+            email=self._parse_labeled(content_lines, "Email:"),
+            phone=self._parse_labeled(content_lines, "Phone:"),
+        )
+
+        if not any([staff.department, staff.office, staff.email, staff.phone]):
+            return None
+        return staff
+
+    @staticmethod
+    def _parse_department(content_lines: list[str]) -> str | None:
         for line in content_lines:
             if line.startswith("Unit:"):
                 return line.split("Unit:", 1)[1].strip()
+        return None
 
+    @staticmethod
+    def _parse_labeled(content_lines: list[str], label: str) -> str | None:
+        for i, line in enumerate(content_lines):
+            if label in line:
+                if i + 1 < len(content_lines):
+                    return content_lines[i + 1]
         return None
 
-    def resolve_id_to_office(self, staff_id: str) -> str | None:
+    def resolve_id_to_department(self, staff_id: str) -> str | None:
         """
         Args:
             staff_id (str): Staff members ID.
         """
 
         soup: BeautifulSoup = self._fetch_soup_staff(staff_id)
-        content = self._get_raw_html(soup)
-        content_lines = content.splitlines()
+        content_lines = self._get_raw_html(soup).splitlines()
+        return self._parse_department(content_lines)
 
-        for i, line in enumerate(content_lines):
-            if "Office:" in line:
-                if i + 1 < len(content_lines):
-                    return content_lines[i + 1]
-        return None
+    def resolve_id_to_office(self, staff_id: str) -> str | None:
+        """
+        Args:
+            staff_id (str): Staff members ID.
+        """
+
+        soup: BeautifulSoup = self._fetch_soup_staff(staff_id)
+        content_lines = self._get_raw_html(soup).splitlines()
+        return self._parse_labeled(content_lines, "Office:")
 
     def resolve_id_to_email(self, staff_id: str) -> str | None:
         """
@@ -232,14 +468,8 @@ class StaffLookup:
         """
 
         soup: BeautifulSoup = self._fetch_soup_staff(staff_id)
-        content = self._get_raw_html(soup)
-        content_lines = content.splitlines()
-
-        for i, line in enumerate(content_lines):
-            if "Email:" in line:
-                if i + 1 < len(content_lines):
-                    return content_lines[i + 1]
-        return None
+        content_lines = self._get_raw_html(soup).splitlines()
+        return self._parse_labeled(content_lines, "Email:")
 
     def resolve_id_to_phone(self, staff_id: str) -> str | None:
         """
@@ -248,20 +478,5 @@ class StaffLookup:
         """
 
         soup: BeautifulSoup = self._fetch_soup_staff(staff_id)
-        content = self._get_raw_html(soup)
-        content_lines = content.splitlines()
-
-        for i, line in enumerate(content_lines):
-            if "Phone:" in line:
-                if i + 1 < len(content_lines):
-                    return content_lines[i + 1]
-        return None
-
-
-@dataclass
-class Staff:
-    name: str | None
-    department: str | None
-    office: str | None
-    email: str | None
-    phone: str | None
+        content_lines = self._get_raw_html(soup).splitlines()
+        return self._parse_labeled(content_lines, "Phone:")
@@ -8,11 +8,12 @@ bulletins.wayne.edu/faculty/ page into a JSON cache file.
 import json
 import os
 from dataclasses import asdict, dataclass
-from urllib.request import urlopen
 
-import appdirs
 from bs4 import BeautifulSoup
 
+from warrior_bot.utils.http_pool import HTTPPool, default_pool
+from warrior_bot.utils.storage import atomic_write_json, get_cache_dir
+
 BULLETIN_URL = "https://bulletins.wayne.edu/faculty/"
 CACHE_FILE = "faculty_cache.json"
 
@@ -31,14 +32,17 @@ class FacultyName:
         return f"{self.first} {self.last}"
 
 
-def fetch_bulletin_html() -> str:
+def fetch_bulletin_html(http: HTTPPool | None = None) -> str:
     """Fetch the raw HTML from the Wayne State bulletin faculty page.
 
+    Args:
+        http: Connection pool to fetch with. Defaults to the shared pool.
+
     Returns:
         The decoded HTML content of the bulletin faculty page.
     """
-    response = urlopen(BULLETIN_URL)
-    html: str = response.read().decode("utf-8")
+    pool = http if http is not None else default_pool
+    html: str = pool.get(BULLETIN_URL).decode("utf-8")
     return html
 
 
@@ -129,12 +133,25 @@ def build_faculty_cache(output_path: str | None = None) -> list[dict[str, str |
         output_path = get_cache_path()
 
     html = fetch_bulletin_html()
-    raw_names = parse_raw_names(html)
+    faculty = parse_faculty(html)
+    atomic_write_json(output_path, faculty)
+
+    return faculty
+
+
+def parse_faculty(html: str) -> list[dict[str, str | None]]:
+    """Parse bulletin HTML into unique, cleaned faculty name dictionaries.
 
+    Args:
+        html: The HTML content of the bulletin page.
+
+    Returns:
+        List of faculty name dictionaries in bulletin order.
+    """
     seen: set[str] = set()
     faculty: list[dict[str, str | None]] = []
 
-    for raw_name in raw_names:
+    for raw_name in parse_raw_names(html):
         parsed = clean_name(raw_name)
         if parsed:
             key = f"{parsed.first}|{parsed.middle}|{parsed.last}".lower()
@@ -142,9 +159,6 @@ def build_faculty_cache(output_path: str | None = None) -> list[dict[str, str |
                 seen.add(key)
                 faculty.append(asdict(parsed))
 
-    with open(output_path, "w") as f:
-        json.dump(faculty, f, indent=2)
-
     return faculty
 
 
@@ -154,9 +168,7 @@ def get_cache_path() -> str:
     Returns:
         The path to the faculty cache JSON file.
     """
-    cache_dir: str = appdirs.user_cache_dir("warrior_bot", "warrior_bot")
-    os.makedirs(cache_dir, exist_ok=True)
-    return os.path.join(cache_dir, "faculty_cache.json")
+    return os.path.join(get_cache_dir(), CACHE_FILE)
 
 
 def load_faculty_cache(cache_path: str | None = None) -> list[dict[str, str | None]]:
@@ -0,0 +1,214 @@
+"""
+Fuzzy name matching that scales out to a process pool for large candidate sets.
+
+FuzzyMatcher.best(query, cutoff) returns exactly what
+difflib.get_close_matches(query, candidates, n=1, cutoff=cutoff) would, using
+the same quick-ratio filters and (score, candidate) ordering. Small candidate
+lists are scored serially. Once a list reaches PARALLEL_THRESHOLD candidates,
+more than one CPU is available and the matcher has already scored POOL_WARMUP
+candidates serially, it is split into one shard per worker:
+
+    - the pool is started once per matcher and every worker receives the
+      candidate list a single time through the pool initializer, so a query
+      only ships (query, cutoff, shard bounds) to the workers
+    - each worker returns the best (score, candidate) in its shard
+    - the shard winners are merged with max(), which is what nlargest(1)
+      does over the whole list
+
+The warm-up counts pool start-up in the decision: a matcher only starts its
+pool after it has spent about as long scoring serially as the slowest start-up
+measured, so a one-shot command with a few lookups at the threshold size stays
+serial and only processes that keep matching pay for the pool.
+
+Set WARRIOR_BOT_FUZZY_WORKERS to override the worker count (1 disables the
+pool). Measurements behind the constants are in benchmarks/fuzzy_scaling.py.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from typing import Iterator, Sequence
+
+PARALLEL_THRESHOLD = 40_000  # Candidates before scoring is sharded.
+POOL_WARMUP = 120_000  # Candidates scored serially before the pool may start.
+WORKERS_ENV = "WARRIOR_BOT_FUZZY_WORKERS"
+
+# Candidates preloaded into each pool worker by _init_worker.
+_worker_candidates: Sequence[str] = ()
+
+
+def available_workers() -> int:
+    """Number of CPUs this process may run on, or the WORKERS_ENV override."""
+    override = os.environ.get(WORKERS_ENV)
+    if override:
+        return max(1, int(override))
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS or Windows.
+        return os.cpu_count() or 1
+
+
+def score_range(
+    query: str, candidates: Sequence[str], cutoff: float, start: int, stop: int
+) -> tuple[float, str] | None:
+    """Best (ratio, candidate) in candidates[start:stop] at or above cutoff.
+
+    Mirrors the filtering inside difflib.get_close_matches.
+    """
+    best: tuple[float, str] | None = None
+    s = SequenceMatcher()
+    s.set_seq2(query)
+    for i in range(start, stop):
+        x = candidates[i]
+        s.set_seq1(x)
+        if (
+            s.real_quick_ratio() >= cutoff
+            and s.quick_ratio() >= cutoff
+            and s.ratio() >= cutoff
+        ):
+            scored = (s.ratio(), x)
+            if best is None or scored > best:
+                best = scored
+    return best
+
+
+def _init_worker(candidates: Sequence[str]) -> None:
+    global _worker_candidates
+    _worker_candidates = candidates
+
+
+def _score_shard(
+    query: str, cutoff: float, start: int, stop: int
+) -> tuple[float, str] | None:
+    return score_range(query, _worker_candidates, cutoff, start, stop)
+
+
+class FuzzyMatcher:
+    """Closest-match search over a fixed list of candidate strings.
+
+    Attributes:
+        candidates (tuple): Strings to match against.
+        workers (int): Processes used when scoring in parallel.
+        threshold (int): Candidate count at which scoring goes parallel.
+        warmup (int): Candidates to score serially before starting the pool.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[str],
+        workers: int | None = None,
+        threshold: int = PARALLEL_THRESHOLD,
+        warmup: int = POOL_WARMUP,
+    ) -> None:
+        self.candidates = tuple(candidates)
+        self.workers = workers if workers is not None else available_workers()
+        self.threshold = threshold
+        self.warmup = warmup
+        self._scored = 0  # Candidates scored serially so far.
+        self._pool: ProcessPoolExecutor | None = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Managed by shared_matcher under _shared_lock.
+        self._users = 0
+        self._retired = False
+
+    @property
+    def parallel(self) -> bool:
+        """Whether the next best() shards scoring across the process pool."""
+        return (
+            self.workers > 1
+            and len(self.candidates) >= self.threshold
+            and self._scored >= self.warmup
+        )
+
+    def best(self, query: str, cutoff: float = 0.6) -> str | None:
+        """Return the closest candidate with a ratio of at least cutoff, or None."""
+        if not self.parallel:
+            self._scored += len(self.candidates)
+            found = score_range(query, self.candidates, cutoff, 0, len(self.candidates))
+            return found[1] if found else None
+
+        pool = self._get_pool()
+        step = -(-len(self.candidates) // self.workers)
+        futures = [
+            pool.submit(
+                _score_shard,
+                query,
+                cutoff,
+                start,
+                min(start + step, len(self.candidates)),
+            )
+            for start in range(0, len(self.candidates), step)
+        ]
+        winners = [w for w in (f.result() for f in futures) if w is not None]
+        return max(winners)[1] if winners else None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("FuzzyMatcher is closed")
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.candidates,),
+                )
+            return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any were started.
+
+        A closed matcher never starts a new pool: parallel best() calls raise
+        RuntimeError, serial ones keep working.
+        """
+        with self._lock:
+            self._closed = True
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def __enter__(self) -> "FuzzyMatcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+_shared: FuzzyMatcher | None = None
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def shared_matcher(candidates: Sequence[str]) -> Iterator[FuzzyMatcher]:
+    """Use a matcher for candidates, reusing the last one if they are equal.
+
+    Callers that rebuild the same candidate list on every query (like
+    StaffLookup.match_faculty) keep one warm process pool this way. When the
+    candidates change, the previous matcher is retired and its pool is shut
+    down once the last caller still using it leaves the with block.
+    """
+    global _shared
+    key = tuple(candidates)
+    retired: FuzzyMatcher | None = None
+    with _shared_lock:
+        if _shared is None or _shared.candidates != key:
+            if _shared is not None:
+                _shared._retired = True
+                if _shared._users == 0:
+                    retired = _shared
+            _shared = FuzzyMatcher(key)
+        matcher = _shared
+        matcher._users += 1
+    if retired is not None:
+        retired.close()
+
+    try:
+        yield matcher
+    finally:
+        with _shared_lock:
+            matcher._users -= 1
+            done = matcher._retired and matcher._users == 0
+        if done:
+            matcher.close()
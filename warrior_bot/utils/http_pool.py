@@ -0,0 +1,188 @@
+"""
+Shared HTTP client with per-host keep-alive connection pooling.
+
+urlopen opens a fresh TCP (and TLS) connection for every request, which adds
+up when a sync pages through the directory or refreshes many profiles. HTTPPool
+keeps idle connections per host and hands them out to whichever thread asks
+next, so concurrent sync services and lookups share the same warm sockets.
+
+Proxies configured the way urlopen reads them (HTTP_PROXY, HTTPS_PROXY and
+NO_PROXY, or the system settings on macOS and Windows) are honored: plain HTTP
+is sent to the proxy with an absolute URL, HTTPS is tunneled through it with
+CONNECT.
+
+Failures surface the same way urlopen reports them: HTTP error statuses raise
+urllib.error.HTTPError and connection problems raise OSError.
+"""
+
+import base64
+import http.client
+import threading
+from email.message import Message
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+POOL_SIZE = 8  # Idle connections kept per host.
+MAX_REDIRECTS = 5
+TIMEOUT = 10.0  # Default socket timeout in seconds, so no request hangs forever.
+USER_AGENT = "warrior-bot"
+
+_ConnKey = tuple[str, str, int, str]  # scheme, host, port, proxy URL or ""
+
+
+def _parse_proxy(proxy: str) -> tuple[str, int, dict[str, str]]:
+    """Split a proxy URL into host, port and its Proxy-Authorization header."""
+    parts = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers = {}
+    if parts.username is not None:
+        user_pass = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(user_pass.encode()).decode("ascii")
+        headers["Proxy-Authorization"] = f"Basic {token}"
+    return parts.hostname or "", parts.port or 80, headers
+
+
+class HTTPPool:
+    """Thread-safe pool of keep-alive HTTP(S) connections.
+
+    Attributes:
+        pool_size (int): Idle connections kept per host.
+        timeout (float | None): Default socket timeout in seconds.
+        proxies (dict): Proxy URL per scheme, as urllib.request.getproxies().
+        requests (int): Number of HTTP requests sent through the pool.
+        connections (int): Number of connections the pool has opened.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = POOL_SIZE,
+        timeout: float | None = TIMEOUT,
+        proxies: dict[str, str] | None = None,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.proxies = proxies if proxies is not None else getproxies()
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._idle: dict[_ConnKey, list[http.client.HTTPConnection]] = {}
+
+    def _acquire(
+        self, key: _ConnKey, timeout: float | None
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            if conn is None:
+                self.connections += 1
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        scheme, host, port, proxy = key
+        if not proxy:
+            if scheme == "https":
+                return http.client.HTTPSConnection(host, port, timeout=timeout), False
+            return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+        proxy_host, proxy_port, auth = _parse_proxy(proxy)
+        if scheme == "https":
+            tunnel = http.client.HTTPSConnection(
+                proxy_host, proxy_port, timeout=timeout
+            )
+            tunnel.set_tunnel(host, port, headers=auth)
+            return tunnel, False
+        return (
+            http.client.HTTPConnection(proxy_host, proxy_port, timeout=timeout),
+            False,
+        )
+
+    def _release(self, key: _ConnKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.pool_size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _request(
+        self, url: str, timeout: float | None
+    ) -> tuple[http.client.HTTPResponse, bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or "http"
+        port = parts.port or (443 if scheme == "https" else 80)
+        host = parts.hostname or ""
+        proxy = self.proxies.get(scheme, "")
+        if proxy and proxy_bypass(host):
+            proxy = ""
+        key: _ConnKey = (scheme, host, port, proxy)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        if proxy and scheme != "https":
+            # Plain HTTP goes to the proxy itself, which needs the full URL.
+            path = f"{scheme}://{parts.netloc}{path}"
+            headers.update(_parse_proxy(proxy)[2])
+
+        conn, reused = self._acquire(key, timeout)
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            if not reused:
+                raise
+            # The server may have dropped an idle keep-alive socket; retry once.
+            conn, _ = self._acquire(key, timeout)
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except BaseException:
+                conn.close()
+                raise
+
+        with self._lock:
+            self.requests += 1
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return response, body
+
+    def get(self, url: str, timeout: float | None = None) -> bytes:
+        """Fetch url with a pooled connection, following redirects.
+
+        Args:
+            url: Absolute http(s) URL to fetch.
+            timeout: Socket timeout in seconds, defaults to the pool timeout.
+
+        Returns:
+            The raw response body.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        for _ in range(MAX_REDIRECTS + 1):
+            response, body = self._request(url, timeout)
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPError(url, response.status, response.reason, Message(), None)
+            return body
+        raise HTTPError(url, 310, "Too many redirects", Message(), None)
+
+    def close(self) -> None:
+        """Close every idle connection held by the pool."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+default_pool = HTTPPool()
@@ -0,0 +1,443 @@
+"""
+Shared knowledge index behind warrior-bot's lookup commands.
+
+Every data source is loaded into typed records instead of each command loading
+and scanning its own files:
+
+    person  key: searchable faculty name variant  value: corrected query
+    place   key: normalized locations.json key    value: location text
+    club    key: normalized club name             value: description
+    link    key: normalized link name             value: URL
+
+A command never picks sources itself. plan(command) names the record kinds it
+searches, in priority order, and KnowledgeIndex.query walks that plan. Each
+kind keeps the ranking its command already used: places and links rank like
+DataHandler.search, people like StaffLookup.match_faculty, so `where` answers
+the same whichever backend it runs on.
+
+Places whose locations.json entry has "coordinates" also carry a latitude,
+longitude and type tags (category, building type, detail group such as
+"food"), and are indexed in a KD-tree per tag for nearest-place queries.
+
+Records are persisted to a JSON file in the user cache directory together with
+a signature (path, mtime, size) of the files each source was built from. A
+source is only rebuilt when one of its files changes.
+
+New data sources (clubs, ...) plug in by calling register_source.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+from warrior_bot.core.data_handler import (
+    DataHandler,
+    LocationSnapshot,
+    best_key,
+    normalize_query,
+)
+from warrior_bot.utils import faculty_parser
+from warrior_bot.utils.bm25 import BM25Index
+from warrior_bot.utils.faculty_lookup import FACULTY_CUTOFF, StaffLookup
+from warrior_bot.utils.fuzzy import shared_matcher
+from warrior_bot.utils.spatial import SpatialIndex
+from warrior_bot.utils.storage import (
+    PACKAGE_DATA_DIR,
+    atomic_write_json,
+    get_cache_dir,
+    resolve_data_file,
+)
+
+INDEX_FILE = "knowledge_index.json"
+INDEX_VERSION = 2
+
+KINDS = ("person", "place", "club", "link")
+
+# Record kinds each command searches, highest priority first.
+COMMAND_KINDS: dict[str, tuple[str, ...]] = {
+    "where": ("person", "place"),
+    "whois": ("person",),
+    "what": ("club", "place"),
+    "go": ("link",),
+}
+
+
+def get_index_path() -> str:
+    """Get the default path of the persisted knowledge index.
+
+    Returns:
+        The path to the index JSON file in the user cache directory.
+    """
+    return os.path.join(get_cache_dir(), INDEX_FILE)
+
+
+def plan(command: str) -> tuple[str, ...]:
+    """Return the record kinds a command searches, highest priority first.
+
+    Raises:
+        KeyError: If the command has no plan.
+    """
+    return COMMAND_KINDS[command]
+
+
+@dataclass(frozen=True)
+class Record:
+    """One searchable fact.
+
+    Attributes:
+        kind (str): One of KINDS.
+        key (str): Normalized text the record is matched on.
+        label (str): Original spelling of the key.
+        value (str): What the command answers with.
+        source (str): Name of the source the record came from.
+        lat (float): Latitude, for places with coordinates.
+        lon (float): Longitude, for places with coordinates.
+        tags (tuple): Normalized types the place is found under by --type.
+    """
+
+    kind: str
+    key: str
+    label: str
+    value: str
+    source: str
+    lat: float | None = None
+    lon: float | None = None
+    tags: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class KnowledgeSource:
+    """A named loader of records.
+
+    Attributes:
+        name (str): Name the records are persisted under.
+        files (Callable): Returns the files the records are built from.
+        load (Callable): Builds the records from those files.
+    """
+
+    name: str
+    files: Callable[[], list[str]]
+    load: Callable[[], list[Record]]
+
+
+SOURCES: dict[str, KnowledgeSource] = {}
+
+
+def register_source(source: KnowledgeSource) -> KnowledgeSource:
+    """Add a source to the registry, replacing any with the same name."""
+    SOURCES[source.name] = source
+    return source
+
+
+def location_records(
+    locations: LocationSnapshot, source: str = "locations"
+) -> list[Record]:
+    """Build place and link records from a loaded locations document.
+
+    Args:
+        locations: DataHandler.snapshot.
+        source: Source name stored on the records.
+
+    Returns:
+        Place records in DataHandler.search order, then link records.
+    """
+    data, flat = locations.data, locations.flat
+    located = _located_keys(data)
+    records = [
+        Record("place", nk, orig, flat[orig], source, *located.get(nk, (None, None)))
+        for nk, orig in locations.normalized.items()
+    ]
+
+    contact = data.get("contact")
+    if isinstance(contact, dict):
+        for name, url in contact.items():
+            if isinstance(url, str) and url.startswith("http"):
+                key = str(name).lower().replace("_", " ")
+                records.append(Record("link", key, str(name), url, source))
+    return records
+
+
+def normalize_tag(tag: str) -> str:
+    """Normalize a --type value or a tag taken from locations.json."""
+    return tag.lower().replace("_", " ").replace("-", " ").strip()
+
+
+def _located_keys(
+    data: Mapping[str, object],
+) -> dict[str, tuple[float, float, tuple[str, ...]]]:
+    """Map normalized flat keys of entries with coordinates to (lat, lon, tags).
+
+    A building's name is tagged with its category and type, its code only
+    locates it (so --near accepts codes without listing a building twice), and
+    each detail is tagged with its group, e.g. "panda express" with "food".
+    """
+    located: dict[str, tuple[float, float, tuple[str, ...]]] = {}
+    categories = data.get("categories")
+    if not isinstance(categories, dict):
+        return located
+
+    for category, entries in categories.items():
+        for item in entries if isinstance(entries, list) else []:
+            coordinates = item.get("coordinates") if isinstance(item, dict) else None
+            if not isinstance(coordinates, dict):
+                continue
+            try:
+                lat, lon = float(coordinates["lat"]), float(coordinates["lon"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            def locate(key: object, tags: tuple[str, ...] = ()) -> None:
+                located[str(key).lower().replace("_", " ")] = (lat, lon, tags)
+
+            building_tags: tuple[str, ...] = (normalize_tag(category),)
+            if item.get("type"):
+                building_tags += (normalize_tag(str(item["type"])),)
+            if "code" in item:
+                locate(item["code"])
+            if "name" in item:
+                locate(item["name"], tuple(dict.fromkeys(building_tags)))
+
+            details = item.get("details")
+            for dk, dv in details.items() if isinstance(details, dict) else []:
+                if isinstance(dv, dict):
+                    for subk in dv:
+                        locate(subk, (normalize_tag(dk),))
+                elif dk != "description":
+                    locate(dk, (normalize_tag(dk),))
+    return located
+
+
+def person_records(
+    faculty: list[dict[str, str | None]], source: str = "faculty"
+) -> list[Record]:
+    """Build person records from faculty cache entries.
+
+    Each searchable name variant is stored with the corrected query that
+    StaffLookup.match_faculty would return for it, so matching a person never
+    has to scan the faculty list again.
+
+    Args:
+        faculty: Entries as returned by load_faculty_cache.
+        source: Source name stored on the records.
+
+    Returns:
+        One record per distinct searchable name variant.
+    """
+    # The first entry whose first and last names both appear in the variant.
+    first_seen: dict[tuple[str, str], int] = {}
+    for i, entry in enumerate(faculty):
+        pair = ((entry.get("first") or "").lower(), (entry.get("last") or "").lower())
+        first_seen.setdefault(pair, i)
+
+    records: dict[str, Record] = {}
+    for name in StaffLookup._build_searchable_names(faculty):
+        if name in records:
+            continue
+        tokens = set(name.split())
+        hits = [
+            first_seen[(a, b)] for a in tokens for b in tokens if (a, b) in first_seen
+        ]
+        value = StaffLookup._cache_entry_to_query(faculty[min(hits)]) if hits else ""
+        records[name] = Record("person", name, name, value, source)
+    return list(records.values())
+
+
+class KnowledgeIndex:
+    """In-memory index of typed records with per-kind ranking.
+
+    Implements the same search/match_faculty interface as SQLiteStore, so it
+    can be passed to StaffLookup as its store.
+    """
+
+    def __init__(self, records: Iterable[Record]) -> None:
+        self._records: dict[str, dict[str, Record]] = {k: {} for k in KINDS}
+        for record in records:
+            # Keep the first record per key, like the sources' own dicts.
+            self._records.setdefault(record.kind, {}).setdefault(record.key, record)
+        self._labels = {
+            kind: {key: r.label for key, r in by_key.items()}
+            for kind, by_key in self._records.items()
+        }
+        self._bm25 = {
+            kind: BM25Index((key, f"{key} {r.value}") for key, r in by_key.items())
+            for kind, by_key in self._records.items()
+            if kind != "person"
+        }
+        self._people = tuple(self._records["person"])
+
+        located = [r for r in self.records("place") if r.lat is not None]
+        self._located_labels = {r.key: r.label for r in located}
+        by_tag: dict[str, list[Record]] = {"": [r for r in located if r.tags]}
+        for record in located:
+            for tag in record.tags:
+                by_tag.setdefault(tag, []).append(record)
+        # One tree per tag keeps --type queries sub-linear however rare the tag.
+        self._spatial = {
+            tag: SpatialIndex((r.lat or 0.0, r.lon or 0.0, r) for r in group)
+            for tag, group in by_tag.items()
+        }
+
+    def __len__(self) -> int:
+        return sum(len(by_key) for by_key in self._records.values())
+
+    def records(self, kind: str) -> list[Record]:
+        """All records of one kind, in load order."""
+        return list(self._records.get(kind, {}).values())
+
+    def best(self, kind: str, text: str) -> Record | None:
+        """Return the best record of one kind for text, or None."""
+        by_key = self._records.get(kind)
+        if not by_key:
+            return None
+
+        if kind == "person":
+            query = text.lower().replace(",", "").strip()
+            reversed_query = " ".join(reversed(query.split()))
+            # Shared, so rebuilt indexes reuse one matcher (and its pool).
+            with shared_matcher(self._people) as matcher:
+                for q in [query, reversed_query]:
+                    match = matcher.best(q, cutoff=FACULTY_CUTOFF)
+                    if match:
+                        return by_key[match]
+            return None
+
+        key = best_key(normalize_query(text), self._labels[kind], self._bm25[kind])
+        return by_key[key] if key is not None else None
+
+    def query(self, command: str, text: str) -> list[Record]:
+        """Run a command's plan, returning the best record of each kind."""
+        found = (self.best(kind, text) for kind in plan(command))
+        return [r for r in found if r is not None]
+
+    def search(self, query: str) -> str | None:
+        """Equivalent of DataHandler.search over the place records."""
+        record = self.best("place", query)
+        return record.value if record else None
+
+    def match_faculty(self, user_input: str) -> str | None:
+        """Equivalent of StaffLookup.match_faculty over the person records."""
+        record = self.best("person", user_input)
+        return record.value if record and record.value else None
+
+    def place_types(self) -> list[str]:
+        """Tags that nearest() accepts, sorted."""
+        return sorted(tag for tag in self._spatial if tag)
+
+    def locate(self, text: str) -> Record | None:
+        """Return the best place record with coordinates for text, or None."""
+        key = best_key(normalize_query(text), self._located_labels)
+        return self._records["place"][key] if key is not None else None
+
+    def nearest(
+        self, anchor: Record, k: int = 5, place_type: str | None = None
+    ) -> list[tuple[float, Record]]:
+        """Find the k tagged places closest to anchor.
+
+        Args:
+            anchor: A record returned by locate.
+            k: Maximum number of places to return.
+            place_type: Only return places with this tag.
+
+        Returns:
+            (distance in metres, record) pairs, closest first, never including
+            the anchor itself.
+        """
+        tree = self._spatial.get(normalize_tag(place_type) if place_type else "")
+        if tree is None or anchor.lat is None or anchor.lon is None:
+            return []
+        return tree.nearest(
+            anchor.lat, anchor.lon, k, accept=lambda r: r.value != anchor.value
+        )
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "KnowledgeIndex":
+        """Load every registered source, reusing persisted records when current.
+
+        Args:
+            path: Location of the persisted index, defaults to get_index_path().
+
+        Returns:
+            An index over the records of every registered source.
+        """
+        path = path if path is not None else get_index_path()
+        try:
+            with open(path, "r") as f:
+                persisted: dict[str, Any] = json.load(f)
+            if persisted.get("version") != INDEX_VERSION:
+                persisted = {}
+        except (OSError, json.JSONDecodeError):
+            persisted = {}
+
+        sources = persisted.get("sources", {})
+        changed = False
+        for name, source in SOURCES.items():
+            signature = [_signature(p) for p in source.files()]
+            entry = sources.get(name)
+            if entry is None or entry.get("signature") != signature:
+                records = source.load()
+                # Loading may publish the file it read (e.g. the faculty cache
+                # copies its bundled file), so sign what exists afterwards.
+                signature = [_signature(p) for p in source.files()]
+                sources[name] = {
+                    "signature": signature,
+                    "records": [
+                        [r.kind, r.key, r.label, r.value, r.lat, r.lon, list(r.tags)]
+                        for r in records
+                    ],
+                }
+                changed = True
+
+        if changed:
+            try:
+                atomic_write_json(path, {"version": INDEX_VERSION, "sources": sources})
+            except OSError:
+                pass  # A read-only cache only costs a rebuild next time.
+
+        return cls(
+            Record(kind, key, label, value, name, lat, lon, tuple(tags))
+            for name in SOURCES
+            for kind, key, label, value, lat, lon, tags in sources[name]["records"]
+        )
+
+
+def _signature(path: str) -> list[object]:
+    try:
+        st = os.stat(path)
+        return [os.path.abspath(path), st.st_mtime_ns, st.st_size]
+    except OSError:
+        return [os.path.abspath(path), None, None]
+
+
+# --- locations --------------------------------------------------------------
+
+
+def _location_files() -> list[str]:
+    return [resolve_data_file("locations.json")]
+
+
+def _load_locations() -> list[Record]:
+    path = resolve_data_file("locations.json")
+    handler = DataHandler(os.path.dirname(path), os.path.basename(path))
+    return location_records(handler.snapshot)
+
+
+register_source(KnowledgeSource("locations", _location_files, _load_locations))
+
+
+# --- faculty ----------------------------------------------------------------
+
+
+def _faculty_files() -> list[str]:
+    # The file load_faculty_cache reads: the synced cache, else the bundled copy.
+    synced = faculty_parser.get_cache_path()
+    if os.path.exists(synced):
+        return [synced]
+    return [os.path.join(PACKAGE_DATA_DIR, faculty_parser.CACHE_FILE)]
+
+
+def _load_faculty() -> list[Record]:
+    return person_records(faculty_parser.load_faculty_cache())
+
+
+register_source(KnowledgeSource("faculty", _faculty_files, _load_faculty))
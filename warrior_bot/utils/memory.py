@@ -0,0 +1,196 @@
+"""
+Memory diagnostics for the datasets and caches warrior-bot keeps in memory.
+
+collect_memory_report loads the same structures a long-running process holds
+(the locations document, its flattened search map and BM25 index, the faculty
+cache and its searchable name variants, the knowledge index `where` searches,
+the staff lookup cache and the shared HTTP pool) while tracemalloc is tracing,
+then reports:
+
+    - the deep size and entry count of every structure
+    - total traced memory (current and peak) for the whole load
+    - the top allocation sites by size
+
+Deep sizes follow containers recursively. Objects shared between structures
+(e.g. strings referenced from both `data` and `flat`) are counted in each
+structure they are reachable from, so sizes are upper bounds, not a partition.
+"""
+
+import importlib.metadata
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable
+
+from warrior_bot.core.data_handler import DataHandler
+from warrior_bot.utils.faculty_lookup import StaffLookup
+from warrior_bot.utils.faculty_parser import load_faculty_cache
+from warrior_bot.utils.http_pool import default_pool
+from warrior_bot.utils.knowledge import KnowledgeIndex
+from warrior_bot.utils.staff_cache import StaffCache
+from warrior_bot.utils.storage import resolve_data_file
+
+
+def deep_sizeof(obj: object) -> int:
+    """Approximate the memory retained by obj and everything it contains.
+
+    Args:
+        obj: Object to measure. Dicts, lists, tuples, sets and objects with a
+            __dict__ or __slots__ are followed; everything else is a leaf.
+
+    Returns:
+        Total size in bytes, counting each reachable object once.
+    """
+    seen: set[int] = set()
+    stack: list[object] = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+        elif hasattr(current, "__slots__"):
+            for slot in getattr(current, "__slots__", ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return total
+
+
+@dataclass
+class StructureUsage:
+    """Retained size of one in-memory structure."""
+
+    name: str
+    entries: int
+    bytes: int
+    bytes_per_entry: float
+
+
+@dataclass
+class AllocationSite:
+    """Memory traced to a single source line while loading."""
+
+    site: str
+    bytes: int
+    count: int
+
+
+@dataclass
+class MemoryReport:
+    """Everything `wb debug memory` reports, serializable with asdict."""
+
+    structures: list[StructureUsage] = field(default_factory=list)
+    traced_current: int = 0
+    traced_peak: int = 0
+    top_allocations: list[AllocationSite] = field(default_factory=list)
+    load_seconds: float = 0.0
+    warrior_bot_version: str = ""
+    python_version: str = field(default_factory=platform.python_version)
+    created: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _usage(name: str, obj: object, entries: int) -> StructureUsage:
+    size = deep_sizeof(obj)
+    return StructureUsage(name, entries, size, size / entries if entries else 0.0)
+
+
+def _load_datasets() -> dict[str, tuple[object, int]]:
+    """Load every standard dataset, returning (object, entry count) by name."""
+    locations_path = resolve_data_file("locations.json")
+    handler = DataHandler(
+        os.path.dirname(locations_path), os.path.basename(locations_path)
+    )
+    faculty = load_faculty_cache()
+    staff_cache = StaffCache()
+    searchable = StaffLookup._build_searchable_names(faculty)
+    index = KnowledgeIndex.load()
+    cached = {s: staff_cache.keys(s) for s in ("names", "profiles")}
+
+    return {
+        "locations.data": (handler.data, len(handler.data)),
+        "locations.flat": (handler.flat, len(handler.flat)),
+        "locations.bm25": (handler.bm25.postings, len(handler.bm25.postings)),
+        "faculty_cache": (faculty, len(faculty)),
+        "searchable_names": (searchable, len(searchable)),
+        "knowledge_index": (index, len(index)),
+        "staff_cache": (staff_cache._load(), sum(len(v) for v in cached.values())),
+        "http_pool.idle": (
+            default_pool._idle,
+            sum(len(v) for v in default_pool._idle.values()),
+        ),
+    }
+
+
+def collect_memory_report(
+    top: int = 10,
+    loader: Callable[[], dict[str, tuple[object, int]]] = _load_datasets,
+) -> MemoryReport:
+    """Load the standard datasets under tracemalloc and measure them.
+
+    Args:
+        top: Number of allocation sites to report.
+        loader: Returns the structures to measure as {name: (object, entries)}.
+
+    Returns:
+        A MemoryReport for the loaded structures.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+        datasets = loader()
+        load_seconds = time.perf_counter() - start
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ]
+    stats = after.filter_traces(ignore).compare_to(
+        before.filter_traces(ignore), "lineno"
+    )
+    allocations = [
+        AllocationSite(
+            f"{s.traceback[0].filename}:{s.traceback[0].lineno}",
+            s.size_diff,
+            s.count_diff,
+        )
+        for s in stats
+        if s.size_diff > 0
+    ][:top]
+
+    try:
+        version = importlib.metadata.version("warrior-bot")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+
+    return MemoryReport(
+        structures=[_usage(name, obj, n) for name, (obj, n) in datasets.items()],
+        traced_current=current,
+        traced_peak=peak,
+        top_allocations=allocations,
+        load_seconds=load_seconds,
+        warrior_bot_version=version,
+    )
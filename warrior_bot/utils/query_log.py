@@ -0,0 +1,103 @@
+"""
+Small rotating log of resolved staff queries, used to prewarm the staff cache.
+
+Every time `where` resolves a query to a staff ID the log bumps that ID's
+count. The log keeps at most max_entries IDs; when it is full the least used
+(and, among equals, least recently used) entry is rotated out. `wb sync warm`
+reads the top entries and refreshes their directory and profile records ahead
+of demand.
+
+The log is a JSON file in the user cache directory, shaped as:
+
+    {"<staff id>": {"query": "<corrected query>", "name": "<directory name>",
+                    "count": <int>, "last": <epoch>}}
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from warrior_bot.utils.storage import atomic_write_json, get_cache_dir
+
+LOG_FILE = "query_log.json"
+MAX_ENTRIES = 200  # Staff IDs remembered before the least used are dropped.
+
+
+def get_query_log_path() -> str:
+    """Get the default path for the query frequency log.
+
+    Returns:
+        The path to the query log JSON file.
+    """
+    return os.path.join(get_cache_dir(), LOG_FILE)
+
+
+@dataclass
+class QueryLogEntry:
+    """How often a staff ID has been resolved, and from which query."""
+
+    staff_id: str
+    query: str
+    name: str
+    count: int
+    last: float
+
+
+class QueryLog:
+    """JSON backed frequency counts of resolved staff queries.
+
+    Attributes:
+        path (str): Location of the log file.
+        max_entries (int): Staff IDs kept before rotating out the least used.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = MAX_ENTRIES):
+        self.path = path if path is not None else get_query_log_path()
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def record(self, query: str, name: str, staff_id: str) -> None:
+        """Count one resolution of query to staff_id."""
+        with self._lock:
+            data = self._load()
+            entry = data.get(staff_id, {"count": 0})
+            entry.update(
+                query=query, name=name, count=int(entry["count"]) + 1, last=time.time()
+            )
+            data[staff_id] = entry
+
+            while len(data) > self.max_entries:
+                coldest = min(
+                    data, key=lambda k: (data[k]["count"], data[k].get("last", 0))
+                )
+                del data[coldest]
+
+            atomic_write_json(self.path, data)
+
+    def top(self, n: int) -> list[QueryLogEntry]:
+        """Return the n most frequently resolved staff IDs, most used first."""
+        with self._lock:
+            data = self._load()
+        entries = [
+            QueryLogEntry(
+                staff_id=k,
+                query=str(v.get("query", "")),
+                name=str(v.get("name", "")),
+                count=int(v.get("count", 0)),
+                last=float(v.get("last", 0)),
+            )
+            for k, v in data.items()
+        ]
+        entries.sort(key=lambda e: (e.count, e.last), reverse=True)
+        return entries[:n]
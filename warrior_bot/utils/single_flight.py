@@ -0,0 +1,126 @@
+"""
+Single-flight coalescing of identical in-flight lookups.
+
+When several callers ask for the same key at the same moment, only the first
+(the leader) runs the work; everyone else waits for the leader and receives
+the same result, or the same exception. Once the flight lands the key is
+forgotten, so the next call after that starts a new flight (caching results
+is StaffCache's job, not this module's).
+
+SingleFlight.do is safe to call from any number of threads. Coroutines use
+do_async, which never blocks the event loop; asyncio callers and threads share
+the same flights.
+"""
+
+import asyncio
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: BaseException | None = None
+    # Called once the flight lands, to wake coroutines waiting on it.
+    wakers: list[Callable[[], object]] = field(default_factory=list)
+
+
+def _settle(landed: "asyncio.Future[None]") -> None:
+    if not landed.done():  # The waiting coroutine may have been cancelled.
+        landed.set_result(None)
+
+
+class SingleFlight:
+    """Registry of in-flight calls keyed by string.
+
+    Attributes:
+        stats (Counter): "leader" for calls that ran the work, "shared" for
+            calls that received another call's result.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self.stats: Counter[str] = Counter()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn, or wait for an identical call already in flight.
+
+        Args:
+            key: Identifies the work; equal keys must mean equal results.
+            fn: The work to run if no flight for key is in progress.
+
+        Returns:
+            The result of the flight this call ran or joined.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            self._run(key, flight, fn)
+        else:
+            flight.done.wait()
+        value: T = self._result(flight)
+        return value
+
+    async def do_async(self, key: str, fn: Callable[[], T]) -> T:
+        """Awaitable do; joins flights started by threads and vice versa.
+
+        The leader runs fn in a worker thread. Followers wait on a future of
+        their own event loop, so any number of them costs no threads.
+        """
+        flight, leader = self._join(key)
+        if leader:
+            await asyncio.to_thread(self._run, key, flight, fn)
+        else:
+            loop = asyncio.get_running_loop()
+            landed: asyncio.Future[None] = loop.create_future()
+            with self._lock:
+                if flight.done.is_set():
+                    landed.set_result(None)
+                else:
+                    flight.wakers.append(
+                        lambda: loop.call_soon_threadsafe(_settle, landed)
+                    )
+            await landed
+        value: T = self._result(flight)
+        return value
+
+    def _join(self, key: str) -> tuple[_Flight, bool]:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            self.stats["leader" if leader else "shared"] += 1
+        return flight, leader
+
+    def _run(self, key: str, flight: _Flight, fn: Callable[[], Any]) -> None:
+        try:
+            flight.value = fn()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._flights[key]
+                flight.done.set()
+            for wake in flight.wakers:
+                wake()
+
+    @staticmethod
+    def _result(flight: _Flight) -> Any:
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def in_flight(self) -> int:
+        """Number of keys with a call currently running."""
+        with self._lock:
+            return len(self._flights)
+
+
+# Shared by every StaffLookup in the process, so separate instances coalesce.
+default_flights = SingleFlight()
@@ -0,0 +1,129 @@
+"""
+KD-tree for nearest-place queries over latitude/longitude points.
+
+Points are projected onto a local flat plane (equirectangular, centred on the
+mean latitude of the points) so the tree can split on plain x/y metres. Over a
+campus, or even a city, the projection error is far below the precision of the
+coordinates themselves. Returned distances are great-circle metres.
+
+Building is O(n log n); a k-nearest query visits O(log n + k) nodes on
+well-spread data instead of measuring every point.
+"""
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Callable, Generic, Iterable, TypeVar
+
+EARTH_RADIUS_M = 6_371_000.0
+
+T = TypeVar("T")
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+@dataclass
+class _Node(Generic[T]):
+    x: float
+    y: float
+    lat: float
+    lon: float
+    item: T
+    order: int  # Position in the input, so equal distances keep input order.
+    axis: int = 0
+    left: "_Node[T] | None" = None
+    right: "_Node[T] | None" = None
+
+
+class SpatialIndex(Generic[T]):
+    """Static 2-d tree over (lat, lon, item) points."""
+
+    def __init__(self, points: Iterable[tuple[float, float, T]]) -> None:
+        pts = list(points)
+        self._size = len(pts)
+        lat0 = sum(p[0] for p in pts) / len(pts) if pts else 0.0
+        self._cos_lat0 = math.cos(math.radians(lat0))
+        nodes = [
+            _Node(*self._project(lat, lon), lat, lon, item, i)
+            for i, (lat, lon, item) in enumerate(pts)
+        ]
+        self._root = self._build(nodes, 0)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _project(self, lat: float, lon: float) -> tuple[float, float]:
+        x = math.radians(lon) * self._cos_lat0 * EARTH_RADIUS_M
+        y = math.radians(lat) * EARTH_RADIUS_M
+        return x, y
+
+    def _build(self, nodes: list[_Node[T]], depth: int) -> _Node[T] | None:
+        if not nodes:
+            return None
+        axis = depth % 2
+        nodes.sort(key=(lambda n: n.x) if axis == 0 else (lambda n: n.y))
+        mid = len(nodes) // 2
+        node = nodes[mid]
+        node.axis = axis
+        node.left = self._build(nodes[:mid], depth + 1)
+        node.right = self._build(nodes[mid:][1:], depth + 1)
+        return node
+
+    def nearest(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 5,
+        accept: Callable[[T], bool] | None = None,
+    ) -> list[tuple[float, T]]:
+        """Find the k points closest to (lat, lon).
+
+        Args:
+            lat: Latitude of the query point.
+            lon: Longitude of the query point.
+            k: Maximum number of points to return.
+            accept: Optional filter; rejected points are skipped.
+
+        Returns:
+            (distance in metres, item) pairs, closest first.
+        """
+        if k <= 0 or self._root is None:
+            return []
+        qx, qy = self._project(lat, lon)
+
+        # Max-heap of the best k so far as (-squared distance, tiebreak, node).
+        best: list[tuple[float, int, _Node[T]]] = []
+        # Subtrees to visit with a lower bound on their squared distance.
+        stack: list[tuple[float, _Node[T]]] = [(0.0, self._root)]
+        while stack:
+            bound, node = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+
+            d2 = (node.x - qx) ** 2 + (node.y - qy) ** 2
+            if accept is None or accept(node.item):
+                entry = (-d2, -node.order, node)
+                if len(best) < k:
+                    heapq.heappush(best, entry)
+                elif entry[:2] > best[0][:2]:
+                    heapq.heapreplace(best, entry)
+
+            diff = (qx - node.x) if node.axis == 0 else (qy - node.y)
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            if far is not None:
+                stack.append((max(bound, diff * diff), far))
+            if near is not None:
+                stack.append((bound, near))
+
+        found = sorted(best, key=lambda e: (-e[0], -e[1]))
+        return [(haversine_m(lat, lon, n.lat, n.lon), n.item) for _, _, n in found]
@@ -0,0 +1,339 @@
+"""
+Optional SQLite backend for location and staff search.
+
+The JSON backend loads locations.json and the faculty cache on every call and
+scans them linearly. This module builds both into a single SQLite database
+(`wb sync index`) so lookups become indexed queries and nothing is loaded up
+front:
+
+    locations      one row per normalized flattened key, in DataHandler order,
+                   indexed on the key, its last word and its length
+    locations_fts  FTS5 trigram index over the keys for substring candidates
+    bm25_postings  the BM25 inverted index of the keys and their values, with
+                   weights precomputed exactly as DataHandler computes them
+    faculty        faculty cache entries in bulletin order, indexed on the
+                   lowercased first and last names
+    faculty_names  the searchable name variants, indexed on length
+
+Results are kept equivalent to DataHandler.search and StaffLookup.match_faculty:
+the index only narrows the candidate set to rows that could possibly satisfy a
+ranking rule, and the rule itself (regex word boundaries, shortest key, difflib
+cutoff, BM25 merge) is then applied in Python exactly as the JSON backend does. For the
+difflib stages, a ratio >= cutoff requires 2 * min(len) / (sum of lens) >=
+cutoff, which bounds the candidate length and makes a length index an exact
+prefilter.
+"""
+
+import difflib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from typing import Any
+
+from warrior_bot.core.data_handler import LOCATION_CUTOFF, LocationSnapshot
+from warrior_bot.utils.bm25 import Postings, best_document, length_window
+from warrior_bot.utils.faculty_lookup import FACULTY_CUTOFF, StaffLookup
+from warrior_bot.utils.storage import get_cache_dir
+
+DB_FILE = "warrior_bot.sqlite3"
+SCHEMA_VERSION = "2"
+TRIGRAM = 3
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE locations (
+    id INTEGER PRIMARY KEY,
+    nkey TEXT NOT NULL UNIQUE,
+    last_word TEXT NOT NULL,
+    klen INTEGER NOT NULL,
+    has_slash INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX locations_last_word ON locations (last_word, id);
+CREATE INDEX locations_klen ON locations (klen);
+CREATE TABLE faculty (
+    id INTEGER PRIMARY KEY,
+    first TEXT,
+    middle TEXT,
+    last TEXT,
+    first_l TEXT NOT NULL,
+    last_l TEXT NOT NULL
+);
+CREATE INDEX faculty_last_first ON faculty (last_l, first_l, id);
+CREATE TABLE faculty_names (name TEXT PRIMARY KEY, nlen INTEGER NOT NULL);
+CREATE INDEX faculty_names_nlen ON faculty_names (nlen);
+CREATE TABLE bm25_postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    weight REAL NOT NULL
+);
+CREATE INDEX bm25_postings_term ON bm25_postings (term);
+CREATE TABLE bm25_terms (term TEXT PRIMARY KEY, tlen INTEGER NOT NULL);
+CREATE INDEX bm25_terms_tlen ON bm25_terms (tlen);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE locations_fts USING fts5(
+    nkey, content='locations', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO locations_fts (locations_fts) VALUES ('rebuild');
+"""
+
+
+def get_db_path() -> str:
+    """Get the default path of the SQLite search database.
+
+    Returns:
+        The path to the database file in the user cache directory.
+    """
+    return os.path.join(get_cache_dir(), DB_FILE)
+
+
+def build_store(
+    locations: LocationSnapshot,
+    faculty: list[dict[str, str | None]],
+    path: str | None = None,
+) -> str:
+    """Build the search database and atomically publish it.
+
+    Args:
+        locations: DataHandler.snapshot, whose keys and BM25 index are stored.
+        faculty: Faculty cache entries as returned by load_faculty_cache.
+        path: Destination of the database, defaults to get_db_path().
+
+    Returns:
+        The path the database was published to.
+    """
+    path = path if path is not None else get_db_path()
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".sqlite3", dir=directory)
+    os.close(fd)
+
+    try:
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+
+            flat = locations.flat
+            conn.executemany(
+                "INSERT INTO locations (nkey, last_word, klen, has_slash, value) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        nk,
+                        (nk.split() or [""])[-1],
+                        len(nk),
+                        int("/" in orig),
+                        flat[orig],
+                    )
+                    for nk, orig in locations.normalized.items()
+                ),
+            )
+
+            # Document n of the BM25 index is locations row n + 1.
+            bm25 = locations.bm25
+            conn.executemany(
+                "INSERT INTO bm25_postings (term, doc, weight) VALUES (?, ?, ?)",
+                (
+                    (term, doc + 1, weight)
+                    for term, found in bm25.postings.items()
+                    for doc, weight in found
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO bm25_terms (term, tlen) VALUES (?, ?)",
+                ((term, len(term)) for term in bm25.postings),
+            )
+
+            conn.executemany(
+                "INSERT INTO faculty (first, middle, last, first_l, last_l) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        e.get("first"),
+                        e.get("middle"),
+                        e.get("last"),
+                        (e.get("first") or "").lower(),
+                        (e.get("last") or "").lower(),
+                    )
+                    for e in faculty
+                ),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO faculty_names (name, nlen) VALUES (?, ?)",
+                ((n, len(n)) for n in StaffLookup._build_searchable_names(faculty)),
+            )
+
+            try:
+                conn.executescript(FTS_SCHEMA)
+                fts = "1"
+            except sqlite3.OperationalError:
+                # FTS5 or the trigram tokenizer is not compiled in; substring
+                # candidates fall back to a scan of the locations table.
+                fts = "0"
+
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [("schema_version", SCHEMA_VERSION), ("fts", fts)],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return path
+
+
+class SQLiteStore:
+    """Read-only search API over a database built by build_store.
+
+    Safe to share between threads; queries are serialized on one connection.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path if path is not None else get_db_path()
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Missing search database: {self.path}")
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        meta: dict[str, str] = dict(self._query("SELECT key, value FROM meta"))
+        if meta.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(f"Outdated search database: {self.path}")
+        self._fts = meta.get("fts") == "1"
+        self._documents = int(self._query("SELECT COUNT(*) FROM locations")[0][0])
+
+    def _query(
+        self, sql: str, params: tuple[object, ...] = ()
+    ) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _substring_candidates(self, query: str) -> list[tuple[Any, ...]]:
+        """Rows whose key contains query, in DataHandler order."""
+        if self._fts and len(query) >= TRIGRAM:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self._query(
+                "SELECT l.nkey, l.has_slash, l.value FROM locations_fts f "
+                "JOIN locations l ON l.id = f.rowid "
+                "WHERE locations_fts MATCH ? ORDER BY l.id",
+                (phrase,),
+            )
+        else:
+            rows = self._query(
+                "SELECT nkey, has_slash, value FROM locations "
+                "WHERE instr(nkey, ?) > 0 ORDER BY id",
+                (query,),
+            )
+        # The trigram index folds case; re-check the exact substring.
+        return [r for r in rows if query in r[0]]
+
+    def _postings(self, term: str) -> Postings | None:
+        rows = self._query(
+            "SELECT doc, weight FROM bm25_postings WHERE term = ? ORDER BY doc",
+            (term,),
+        )
+        return [(int(doc), float(weight)) for doc, weight in rows] or None
+
+    def _vocabulary(self, low: int, high: int) -> list[str]:
+        rows = self._query(
+            "SELECT term FROM bm25_terms WHERE tlen BETWEEN ? AND ?", (low, high)
+        )
+        return [str(r[0]) for r in rows]
+
+    def search(self, query: str) -> str | None:
+        """Indexed equivalent of DataHandler.search."""
+        query = query.lower().replace("_", " ").strip()
+
+        # exact key match, then a match on the last word of a key
+        for sql in (
+            "SELECT value FROM locations WHERE nkey = ?",
+            "SELECT value FROM locations WHERE last_word = ? ORDER BY id LIMIT 1",
+        ):
+            row = self._query(sql, (query,))
+            if row:
+                return str(row[0][0])
+
+        candidates = self._substring_candidates(query)
+
+        # substring match with word-boundary awareness, avoiding "/" keys
+        pattern = r"\b" + re.escape(query) + r"\b"
+        word_bound = [c for c in candidates if re.search(pattern, c[0])]
+        if word_bound:
+            no_slash = [c for c in word_bound if c[1] == 0] or word_bound
+            return str(min(no_slash, key=lambda c: len(c[0]))[2])
+
+        # general substring match with shortest key
+        if candidates:
+            return str(min(candidates, key=lambda c: len(c[0]))[2])
+
+        # multi-word match against keys and the text they resolve to
+        doc = best_document(query, self._postings, self._vocabulary, self._documents)
+        if doc is not None:
+            row = self._query("SELECT value FROM locations WHERE id = ?", (doc,))
+            return str(row[0][0])
+
+        # fuzzy match, restricted to keys long enough to reach the cutoff
+        low, high = length_window(len(query), LOCATION_CUTOFF)
+        rows = self._query(
+            "SELECT nkey, value FROM locations WHERE klen BETWEEN ? AND ?",
+            (low, high),
+        )
+        values: dict[str, str] = dict(rows)
+        matches = difflib.get_close_matches(
+            query, values.keys(), n=1, cutoff=LOCATION_CUTOFF
+        )
+        if matches:
+            return values[matches[0]]
+
+        return None
+
+    def match_faculty(self, user_input: str) -> str | None:
+        """Indexed equivalent of StaffLookup.match_faculty."""
+        query = user_input.lower().replace(",", "").strip()
+        tokens = query.split()
+        reversed_query = " ".join(reversed(tokens))
+
+        best_match: str | None = None
+        for q in [query, reversed_query]:
+            low, high = length_window(len(q), FACULTY_CUTOFF)
+            names = [
+                r[0]
+                for r in self._query(
+                    "SELECT name FROM faculty_names WHERE nlen BETWEEN ? AND ?",
+                    (low, high),
+                )
+            ]
+            matches = difflib.get_close_matches(q, names, n=1, cutoff=FACULTY_CUTOFF)
+            if matches:
+                best_match = matches[0]
+                break
+
+        if not best_match:
+            return None
+
+        match_tokens = sorted(set(best_match.split()))
+        marks = ", ".join("?" for _ in match_tokens)
+        row = self._query(
+            "SELECT first, middle, last FROM faculty "
+            f"WHERE last_l IN ({marks}) AND first_l IN ({marks}) "
+            "ORDER BY id LIMIT 1",
+            (*match_tokens, *match_tokens),
+        )
+        if not row:
+            return None
+        first, middle, last = row[0]
+        return StaffLookup._cache_entry_to_query(
+            {"first": first, "middle": middle, "last": last}
+        )
@@ -0,0 +1,229 @@
+"""
+Local cache for the outcome of staff directory lookups.
+
+Resolving a staff member takes two round-trips to wayne.edu: the paginated
+directory search that maps a corrected faculty query to a staff ID, and the
+profile page that maps that ID to department/office/email/phone. This module
+remembers both outcomes so that the next identical query can skip the network.
+
+Found records are kept for POSITIVE_TTL and are still served once expired, but
+flagged as stale so the caller can refresh them in the background, up to
+STALE_LIMIT. Misses (no directory link, or a profile without documented
+fields) expire sooner, after NEGATIVE_TTL. Expired entries are dropped from the
+file on every write, so it only grows with the set of live lookups.
+
+The cache is a single JSON file in the user cache directory, shaped as:
+
+    {
+        "names": {"<corrected query>": {"value": {...} | null, "fetched": <epoch>}},
+        "profiles": {"<staff id>": {"value": {...} | null, "fetched": <epoch>}}
+    }
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from warrior_bot.utils.storage import atomic_write_json, file_lock, get_cache_dir
+
+CACHE_FILE = "staff_cache.json"
+POSITIVE_TTL = 7 * 24 * 60 * 60  # Seconds before a found record is stale.
+NEGATIVE_TTL = 6 * 60 * 60  # Seconds a miss is trusted before asking again.
+STALE_LIMIT = 30 * 24 * 60 * 60  # Seconds before a stale record is dropped.
+
+
+def get_staff_cache_path() -> str:
+    """Get the default path for the staff lookup cache JSON file.
+
+    Returns:
+        The path to the staff lookup cache JSON file.
+    """
+    return os.path.join(get_cache_dir(), CACHE_FILE)
+
+
+@dataclass
+class CacheEntry:
+    """A cached lookup outcome.
+
+    Attributes:
+        value (dict | None): The cached record, or None for a recorded miss.
+        stale (bool): True when the record is older than the positive TTL.
+    """
+
+    value: dict[str, Any] | None
+    stale: bool = False
+
+
+class StaffCache:
+    """JSON backed cache of staff directory and profile lookups.
+
+    Attributes:
+        path (str): Location of the cache file.
+        ttl (float): Seconds before a found record is considered stale.
+        negative_ttl (float): Seconds before a recorded miss expires.
+        stale_limit (float): Seconds before a stale record is dropped.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl: float = POSITIVE_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        stale_limit: float = STALE_LIMIT,
+    ) -> None:
+        self.path = path if path is not None else get_staff_cache_path()
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_limit = stale_limit
+        self._lock = threading.Lock()
+        self._data: dict[str, dict[str, dict[str, Any]]] | None = None
+        self._version: tuple[int, int, int] | None = None  # file as last seen
+        self.stats: Counter[str] = Counter()  # hit/stale/negative/miss per read
+
+    def _file_version(self) -> tuple[int, int, int] | None:
+        # Writes replace the file, so a new inode means another writer.
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self) -> dict[str, dict[str, dict[str, Any]]]:
+        if self._data is None:
+            self._version = self._file_version()
+            data: dict[str, dict[str, dict[str, Any]]] = {}
+            try:
+                with open(self.path, "r") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict):
+                    data = loaded
+            except (OSError, json.JSONDecodeError):
+                pass
+            data.setdefault("names", {})
+            data.setdefault("profiles", {})
+            self._data = data
+        return self._data
+
+    def _get(self, section: str, key: str) -> CacheEntry | None:
+        with self._lock:
+            # Pick up what other writers (e.g. `wb sync warm`) stored since.
+            if self._data is not None and self._file_version() != self._version:
+                self._data = None
+            entry = self._load()[section].get(key)
+            result = self._to_entry(entry)
+            if result is None:
+                self.stats["miss"] += 1
+            elif result.value is None:
+                self.stats["negative"] += 1
+            else:
+                self.stats["stale" if result.stale else "hit"] += 1
+        return result
+
+    def _to_entry(self, entry: dict[str, Any] | None) -> CacheEntry | None:
+        if entry is None:
+            return None
+
+        if self._expired(entry, time.time()):
+            return None
+        value: dict[str, Any] | None = entry.get("value")
+        age = time.time() - float(entry.get("fetched", 0))
+        return CacheEntry(value, stale=value is not None and age >= self.ttl)
+
+    def _expired(self, entry: dict[str, Any], now: float) -> bool:
+        age = now - float(entry.get("fetched", 0))
+        limit = self.negative_ttl if entry.get("value") is None else self.stale_limit
+        return age >= limit
+
+    def _put(self, section: str, key: str, value: dict[str, Any] | None) -> None:
+        self._put_many(section, {key: value})
+
+    def _put_many(
+        self, section: str, values: Mapping[str, dict[str, Any] | None]
+    ) -> None:
+        # The file lock keeps other processes and other instances on the same
+        # file from writing between our re-read and our replace.
+        with self._lock, file_lock(self.path):
+            # Re-read if another writer got in since, so its entries survive.
+            if self._file_version() != self._version:
+                self._data = None
+            data = self._load()
+            fetched = time.time()
+            for key, value in values.items():
+                data[section][key] = {"value": value, "fetched": fetched}
+            for entries in (data["names"], data["profiles"]):
+                for key in [k for k, e in entries.items() if self._expired(e, fetched)]:
+                    del entries[key]
+            atomic_write_json(self.path, data)
+            self._version = self._file_version()
+
+    def keys(self, section: str) -> list[str]:
+        """List the keys currently cached in a section ("names" or "profiles")."""
+        with self._lock:
+            return list(self._load()[section].keys())
+
+    def get_name(self, query: str) -> CacheEntry | None:
+        """Look up the cached directory result for a corrected query.
+
+        Returns:
+            CacheEntry whose value holds "name" and "id", a miss entry whose
+            value is None, or None if nothing usable is cached.
+        """
+        return self._get("names", query.lower())
+
+    def put_name(self, query: str, name: str, staff_id: str) -> None:
+        """Cache the directory result for a corrected query."""
+        self._put("names", query.lower(), {"name": name, "id": staff_id})
+
+    def get_profile(self, staff_id: str) -> CacheEntry | None:
+        """Look up the cached profile fields for a staff ID.
+
+        Returns:
+            CacheEntry whose value maps field names to values, a miss entry
+            whose value is None, or None if nothing usable is cached.
+        """
+        return self._get("profiles", staff_id)
+
+    def put_profile(self, staff_id: str, fields: dict[str, str | None]) -> None:
+        """Cache the profile fields for a staff ID."""
+        self._put("profiles", staff_id, dict(fields))
+
+    def put_names(self, names: Mapping[str, tuple[str, str] | None]) -> None:
+        """Cache many (name, staff_id) results in one write; None records a miss."""
+        self._put_many(
+            "names",
+            {
+                q.lower(): {"name": v[0], "id": v[1]} if v is not None else None
+                for q, v in names.items()
+            },
+        )
+
+    def put_profiles(
+        self, profiles: Mapping[str, dict[str, str | None] | None]
+    ) -> None:
+        """Cache many profiles in one write; a None value records a miss."""
+        self._put_many(
+            "profiles",
+            {k: dict(v) if v is not None else None for k, v in profiles.items()},
+        )
+
+    def is_name_miss(self, query: str) -> bool:
+        """Check whether a corrected query recently had no directory result."""
+        entry = self.get_name(query)
+        return entry is not None and entry.value is None
+
+    def record_name_miss(self, query: str) -> None:
+        """Remember that a corrected query produced no /people/ link."""
+        self._put("names", query.lower(), None)
+
+    def is_empty_profile(self, staff_id: str) -> bool:
+        """Check whether a staff ID recently resolved to an empty profile."""
+        entry = self.get_profile(staff_id)
+        return entry is not None and entry.value is None
+
+    def record_empty_profile(self, staff_id: str) -> None:
+        """Remember that a staff ID has no documented profile fields."""
+        self._put("profiles", staff_id, None)
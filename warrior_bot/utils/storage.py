@@ -0,0 +1,117 @@
+"""
+Helpers for locating and publishing warrior-bot's on-disk data files.
+
+Bundled data lives in warrior_bot/data/. Files produced by `wb sync` are
+published into the user cache directory and take precedence over the bundled
+copy once they are at least as new.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+import appdirs
+
+PACKAGE_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def get_cache_dir() -> str:
+    """Get (and create) the per-user cache directory for warrior-bot.
+
+    Returns:
+        The path to the cache directory.
+    """
+    cache_dir: str = appdirs.user_cache_dir("warrior_bot", "warrior_bot")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+
+def resolve_data_file(filename: str) -> str:
+    """Pick the synced copy of a data file if it exists and is current.
+
+    Args:
+        filename: Name of the data file, e.g. "locations.json".
+
+    Returns:
+        The path of the synced copy in the cache directory when it is at least
+        as new as the bundled file, otherwise the bundled path.
+    """
+    bundled = os.path.join(PACKAGE_DATA_DIR, filename)
+    synced = os.path.join(get_cache_dir(), filename)
+    if os.path.exists(synced) and (
+        not os.path.exists(bundled)
+        or os.path.getmtime(synced) >= os.path.getmtime(bundled)
+    ):
+        return synced
+    return bundled
+
+
+def atomic_write_bytes(path: str, payload: bytes) -> None:
+    """Write payload to path without ever exposing a partial file.
+
+    The payload is written to a temporary file in the same directory and then
+    moved over the destination with os.replace, which is atomic on POSIX and
+    Windows.
+
+    Args:
+        path: Destination path.
+        payload: Raw bytes to write.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_json(path: str, data: object) -> None:
+    """Atomically write data to path as indented JSON.
+
+    Args:
+        path: Destination path of the JSON file.
+        data: JSON serializable object to write.
+    """
+    atomic_write_bytes(path, json.dumps(data, indent=2).encode("utf-8"))
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive OS lock on the sidecar file "<path>.lock".
+
+    The lock belongs to the open lock file rather than the process, so it
+    serializes read-modify-write cycles on path between processes and between
+    separate objects in one process alike.
+
+    Args:
+        path: Path of the file being guarded.
+    """
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
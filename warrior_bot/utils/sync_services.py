@@ -0,0 +1,424 @@
+"""
+Registry of the data services refreshed by `wb sync`.
+
+Every service declares three steps:
+
+    fetch(http)   -> raw payload pulled from upstream over the shared HTTPPool
+    parse(raw)    -> structured data, raising ValueError on anything malformed
+    store(parsed) -> atomically publishes the data and returns a record count
+
+A service that fails in fetch or parse never reaches store, so a broken
+upstream page can not replace good local data. run_services runs services
+concurrently; a service only waits for the services named in its depends_on
+that were requested in the same run, and is skipped if any of them failed.
+
+New data sources (whois, clubs, ...) plug in by calling register_service.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from http.client import HTTPException
+from typing import Any, Callable, Iterable
+
+from warrior_bot.core.data_handler import DataHandler, LocationSnapshot
+from warrior_bot.utils.faculty_lookup import PROFILE_FIELDS, StaffLookup
+from warrior_bot.utils.faculty_parser import (
+    fetch_bulletin_html,
+    get_cache_path,
+    load_faculty_cache,
+    parse_faculty,
+)
+from warrior_bot.utils.http_pool import POOL_SIZE, HTTPPool
+from warrior_bot.utils.query_log import QueryLog, QueryLogEntry
+from warrior_bot.utils.sqlite_store import build_store
+from warrior_bot.utils.staff_cache import StaffCache
+from warrior_bot.utils.storage import (
+    atomic_write_json,
+    get_cache_dir,
+    resolve_data_file,
+)
+
+LOCATIONS_URL = (
+    "https://raw.githubusercontent.com/AWS-WSU/warrior-bot/master/"
+    "warrior_bot/data/locations.json"
+)
+
+WARM_TOP_N = 25  # Most queried staff IDs prefetched by `wb sync warm`.
+
+ProgressCallback = Callable[[str, str], None]
+
+
+@dataclass(frozen=True)
+class SyncService:
+    """A named fetch -> parse -> store pipeline.
+
+    Attributes:
+        name (str): Name used on the command line.
+        description (str): One line summary shown in help output.
+        fetch (Callable): Pulls the raw payload using the shared HTTPPool.
+        parse (Callable): Turns the raw payload into publishable data.
+        store (Callable): Publishes parsed data and returns a record count.
+        depends_on (tuple): Services that must finish first when run together.
+        follow_ups (tuple): Services that are run whenever this one is.
+    """
+
+    name: str
+    description: str
+    fetch: Callable[[HTTPPool], Any]
+    parse: Callable[[Any], Any]
+    store: Callable[[Any], int]
+    depends_on: tuple[str, ...] = ()
+    follow_ups: tuple[str, ...] = ()
+
+
+@dataclass
+class SyncResult:
+    """Outcome of running a single service."""
+
+    name: str
+    count: int = 0
+    elapsed: float = 0.0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+SERVICES: dict[str, SyncService] = {}
+
+
+def register_service(service: SyncService) -> SyncService:
+    """Add a service to the registry, replacing any with the same name."""
+    SERVICES[service.name] = service
+    return service
+
+
+def resolve_service_names(names: Iterable[str]) -> tuple[list[str], list[str]]:
+    """Expand "all" and follow-ups and split names into known and unknown.
+
+    Args:
+        names: Service names as typed by the user.
+
+    Returns:
+        Tuple of (known service names in request order, unknown names).
+    """
+    known: list[str] = []
+    unknown: list[str] = []
+    for raw in names:
+        name = raw.strip().lower()
+        if not name:
+            continue
+        expanded = list(SERVICES) if name == "all" else [name]
+        for n in expanded:
+            if n not in SERVICES:
+                unknown.append(n)
+            elif n not in known:
+                known.append(n)
+
+    for n in known:  # known grows while iterating, so follow-ups chain
+        for follow_up in SERVICES[n].follow_ups:
+            if follow_up in SERVICES and follow_up not in known:
+                known.append(follow_up)
+    return known, unknown
+
+
+def run_service(
+    service: SyncService, http: HTTPPool, progress: ProgressCallback | None = None
+) -> SyncResult:
+    """Run one service's fetch, parse and store steps, timing the whole run."""
+    result = SyncResult(service.name)
+    start = time.perf_counter()
+    try:
+        if progress:
+            progress(service.name, "fetching")
+        raw = service.fetch(http)
+        if progress:
+            progress(service.name, "parsing")
+        parsed = service.parse(raw)
+        if progress:
+            progress(service.name, "storing")
+        result.count = service.store(parsed)
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def run_services(
+    names: Iterable[str],
+    http: HTTPPool | None = None,
+    progress: ProgressCallback | None = None,
+) -> list[SyncResult]:
+    """Run the named services concurrently over one shared HTTPPool.
+
+    Args:
+        names: Registered service names to run.
+        http: Connection pool shared by every service.
+        progress: Called with (service name, stage) as each service advances.
+
+    Returns:
+        One SyncResult per service, in the order the names were given. A
+        service whose dependency failed is not run; its result says why.
+    """
+    pending = {n: SERVICES[n] for n in names}
+    order = list(pending)
+    if not pending:
+        return []
+    pool = http if http is not None else HTTPPool()
+    results: dict[str, SyncResult] = {}
+
+    with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+        running: dict[Future[SyncResult], str] = {}
+        while pending or running:
+            # Skipping a service can unblock others, so repeat until stable.
+            scheduled = True
+            while scheduled:
+                scheduled = False
+                for name, service in list(pending.items()):
+                    busy = set(pending) | set(running.values())
+                    if busy.intersection(service.depends_on):
+                        continue
+                    del pending[name]
+                    scheduled = True
+                    failed = [
+                        d
+                        for d in service.depends_on
+                        if d in results and not results[d].ok
+                    ]
+                    if failed:
+                        results[name] = SyncResult(
+                            name, error=f"dependency {failed[0]} failed"
+                        )
+                    else:
+                        future = executor.submit(run_service, service, pool, progress)
+                        running[future] = name
+            if not running:
+                # Only a dependency cycle can leave services unschedulable.
+                for name in pending:
+                    results[name] = SyncResult(name, error="dependency cycle")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return [results[n] for n in order]
+
+
+# --- staff names ------------------------------------------------------------
+
+
+def _parse_staff(html: str) -> list[dict[str, str | None]]:
+    faculty = parse_faculty(html)
+    if not faculty:
+        raise ValueError("no faculty names found on the bulletin page")
+    return faculty
+
+
+def _store_staff(faculty: list[dict[str, str | None]]) -> int:
+    atomic_write_json(get_cache_path(), faculty)
+    return len(faculty)
+
+
+register_service(
+    SyncService(
+        name="staff",
+        description="Parses https://bulletins.wayne.edu/faculty/",
+        fetch=fetch_bulletin_html,
+        parse=_parse_staff,
+        store=_store_staff,
+        follow_ups=("warm", "index"),
+    )
+)
+
+
+# --- staff profiles ---------------------------------------------------------
+
+
+def _fetch_profiles(http: HTTPPool) -> dict[str, bytes]:
+    """Re-download every staff profile already present in the staff cache."""
+    lookup = StaffLookup(cache=StaffCache(), http=http)
+    staff_ids = lookup.cache.keys("profiles")
+
+    def fetch_one(staff_id: str) -> tuple[str, bytes | None]:
+        try:
+            return staff_id, http.get(f"{lookup.STAFF_URL}{staff_id}")
+        except (OSError, HTTPException):
+            return staff_id, None
+
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        pages = dict(executor.map(fetch_one, staff_ids))
+    return {k: v for k, v in pages.items() if v is not None}
+
+
+def _parse_profiles(
+    pages: dict[str, bytes],
+) -> dict[str, dict[str, str | None] | None]:
+    lookup = StaffLookup()
+    profiles: dict[str, dict[str, str | None] | None] = {}
+    for staff_id, html in pages.items():
+        staff = lookup.parse_profile(lookup.soup_from_html(html))
+        profiles[staff_id] = (
+            {f: getattr(staff, f) for f in PROFILE_FIELDS} if staff else None
+        )
+    return profiles
+
+
+def _store_profiles(profiles: dict[str, dict[str, str | None] | None]) -> int:
+    StaffCache().put_profiles(profiles)
+    return len(profiles)
+
+
+register_service(
+    SyncService(
+        name="profiles",
+        description="Refreshes cached https://wayne.edu/people/ profiles",
+        fetch=_fetch_profiles,
+        parse=_parse_profiles,
+        store=_store_profiles,
+    )
+)
+
+
+# --- hot-set prewarming ----------------------------------------------------
+
+
+@dataclass
+class _HotPages:
+    names: dict[str, tuple[str, str] | None]  # re-resolved directory results
+    profiles: dict[str, bytes]  # staff ID -> raw profile page
+
+
+def _fetch_hot_set(http: HTTPPool) -> _HotPages:
+    """Download directory and profile pages for the most queried staff."""
+    lookup = StaffLookup(cache=StaffCache(), http=http)
+    hot = QueryLog().top(WARM_TOP_N)
+    pages = _HotPages({}, {})
+
+    def fetch_one(entry: QueryLogEntry) -> None:
+        staff_id: str | None = entry.staff_id
+        cached = lookup.cache.get_name(entry.query)
+        if cached is None or cached.stale:
+            soup = lookup._fetch_soup_dir(entry.query)
+            if not soup.contents:
+                return
+            found = lookup.parse_directory(soup)
+            pages.names[entry.query] = found
+            staff_id = found[1] if found else None
+        elif cached.value is not None:
+            staff_id = str(cached.value["id"])
+
+        if staff_id:
+            try:
+                pages.profiles[staff_id] = http.get(f"{lookup.STAFF_URL}{staff_id}")
+            except (OSError, HTTPException):
+                pass
+
+    with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+        list(executor.map(fetch_one, hot))
+    return pages
+
+
+def _parse_hot_set(
+    pages: _HotPages,
+) -> tuple[_HotPages, dict[str, dict[str, str | None] | None]]:
+    return pages, _parse_profiles(pages.profiles)
+
+
+def _store_hot_set(
+    parsed: tuple[_HotPages, dict[str, dict[str, str | None] | None]],
+) -> int:
+    pages, profiles = parsed
+    cache = StaffCache()
+    if pages.names:
+        cache.put_names(pages.names)
+    if profiles:
+        cache.put_profiles(profiles)
+    return len(profiles)
+
+
+register_service(
+    SyncService(
+        name="warm",
+        description="Prefetches the most looked up staff into the local cache",
+        fetch=_fetch_hot_set,
+        parse=_parse_hot_set,
+        store=_store_hot_set,
+        depends_on=("staff",),
+    )
+)
+
+
+# --- locations --------------------------------------------------------------
+
+
+def _fetch_locations(http: HTTPPool) -> bytes:
+    return http.get(LOCATIONS_URL)
+
+
+def _parse_locations(raw: bytes) -> dict[str, Any]:
+    data = json.loads(raw)
+    if not isinstance(data, dict) or not isinstance(data.get("categories"), dict):
+        raise ValueError("locations.json has no 'categories' mapping")
+    return data
+
+
+def _store_locations(data: dict[str, Any]) -> int:
+    atomic_write_json(os.path.join(get_cache_dir(), "locations.json"), data)
+    return sum(
+        len(entries)
+        for entries in data["categories"].values()
+        if isinstance(entries, list)
+    )
+
+
+register_service(
+    SyncService(
+        name="locations",
+        description="Downloads the latest campus locations.json",
+        fetch=_fetch_locations,
+        parse=_parse_locations,
+        store=_store_locations,
+        follow_ups=("index",),
+    )
+)
+
+
+# --- sqlite search index ----------------------------------------------------
+
+IndexSources = tuple[LocationSnapshot, list[dict[str, str | None]]]
+
+
+def _fetch_index_sources(http: HTTPPool) -> IndexSources:
+    """Read the local locations and faculty data the index is built from."""
+    path = resolve_data_file("locations.json")
+    handler = DataHandler(os.path.dirname(path), os.path.basename(path))
+    return handler.snapshot, load_faculty_cache()
+
+
+def _parse_index_sources(sources: IndexSources) -> IndexSources:
+    locations, faculty = sources
+    if not locations.flat:
+        raise ValueError("no locations to index")
+    return locations, faculty
+
+
+def _store_index(sources: IndexSources) -> int:
+    locations, faculty = sources
+    build_store(locations, faculty)
+    return len(locations.flat) + len(faculty)
+
+
+register_service(
+    SyncService(
+        name="index",
+        description="Builds the SQLite search index used by --backend sqlite",
+        fetch=_fetch_index_sources,
+        parse=_parse_index_sources,
+        store=_store_index,
+        depends_on=("staff", "locations"),
+    )
+)